@@ -0,0 +1,150 @@
+'''Benchmarks for the path string solvers, hulls and point generators
+
+    Times each entry point for n = 5..16 on seeded random and convex point
+    sets, checks solution counts against the bounds the ResearchData files
+    must satisfy and writes everything as JSON so runs can be compared.
+
+    python Benchmarks.py --output results.json
+'''
+
+import argparse
+import json
+import platform
+import random
+import time
+
+from CleanSolution import *
+from ResearchCorpus import *
+
+def bestTime(function, repeat):
+    '''Returns the fastest of repeat timed calls of function in seconds'''
+
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def seededPoints(n, seed, convex=False):
+    '''Returns a point set sorted by height drawn from a fixed seed'''
+
+    random.seed(seed)
+    if convex:
+        points = generateConvexPoints(n)
+    else:
+        points = generatePoints(1000, 1000, n)
+    points.sort(key=lambda p: p.y)
+    return points
+
+def benchmarkPointSet(n, seed, convex, repeat, strings, sweepMax):
+    '''Times every entry point on one seeded point set of n points'''
+
+    points = seededPoints(n, seed, convex)
+    random.seed(seed)
+    sample = [randomPathString(n - 1) for i in range(strings)]
+    crossings = SegmentCrossingTable(points)
+    timings = {}
+
+    timings["SegmentCrossingTable"] = bestTime(lambda: SegmentCrossingTable(points), repeat)
+    timings["pathStringIndexDP"] = bestTime(
+        lambda: [pathStringIndexDP(points, s, {}, crossings) for s in sample], repeat)
+    timings["pathStringDP"] = bestTime(
+        lambda: [pathStringDP(points, s) for s in sample], repeat)
+    timings["hasSolution"] = bestTime(
+        lambda: [hasSolution(points, s, True, crossings) for s in sample], repeat)
+    timings["hullJumping"] = bestTime(
+        lambda: [hullJumping(list(points), s) for s in sample], repeat)
+    timings["convexHull"] = bestTime(lambda: convexHull(list(points), True), repeat)
+    if n <= sweepMax:
+        timings["levelSweep"] = bestTime(lambda: levelSweep(points, crossings), 1)
+    if not convex:
+        timings["generatePoints"] = bestTime(lambda: generatePoints(1000, 1000, n), repeat)
+        timings["generatePointArrays"] = bestTime(
+            lambda: generatePointArrays(1000, 1000, n, 100, seed), repeat)
+
+    return {
+        "n": n,
+        "points": "convex" if convex else "random",
+        "seed": seed,
+        "strings": len(sample),
+        "seconds": timings,
+    }
+
+def checkResearchData(seed, checkMax):
+    '''Checks the recorded counts and the solver against each other
+
+        The recorded point sets are not kept, so only point set independent
+        facts are checked: every recorded count lies between 1 and the
+        partialOrderings upper bound, and for string lengths up to checkMax
+        the solver's counts on a seeded point set of the same size do too
+    '''
+
+    checks = []
+    for name, countFile in loadResearchData().items():
+        rows = 0
+        recordedFailures = []
+        solverFailures = []
+        for length in countFile:
+            table = countFile[length]
+            rows += len(table)
+            recordedFailures += [str(string) for string in table.outOfBounds()]
+
+            n = length + 1
+            if n > checkMax:
+                continue
+            solver = PathStringSolver(seededPoints(n, seed), inOrder=True)
+            bounds = table.bounds()
+            for bits in np.flatnonzero(table.observations()).tolist():
+                string = PathString(bits, length)
+                if not 1 <= solver.count(string) <= bounds[bits]:
+                    solverFailures.append(str(string))
+
+        checks.append({
+            "file": name,
+            "rows": rows,
+            "recordedOutOfBounds": recordedFailures,
+            "solverOutOfBounds": solverFailures,
+            "warnings": countFile.warnings,
+            "passed": not recordedFailures and not solverFailures,
+        })
+    return checks
+
+def runBenchmarks(low=5, high=16, seed=0, repeat=3, strings=5, sweepMax=12, checkMax=11):
+    '''Runs every benchmark and check and returns the results as a dictionary'''
+
+    results = []
+    for n in range(low, high + 1):
+        for convex in (False, True):
+            results.append(benchmarkPointSet(n, seed + n, convex, repeat, strings, sweepMax))
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "settings": {"low": low, "high": high, "seed": seed, "repeat": repeat,
+                     "strings": strings, "sweepMax": sweepMax, "checkMax": checkMax},
+        "results": results,
+        "checks": checkResearchData(seed, checkMax),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--low", type=int, default=5, help="smallest n")
+    parser.add_argument("--high", type=int, default=16, help="largest n")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per entry point")
+    parser.add_argument("--strings", type=int, default=5, help="random strings solved per point set")
+    parser.add_argument("--sweep-max", type=int, default=12, help="largest n for a full levelSweep")
+    parser.add_argument("--check-max", type=int, default=11, help="largest n solved for the checks")
+    parser.add_argument("--output", help="file to write the JSON to instead of stdout")
+    args = parser.parse_args()
+
+    report = runBenchmarks(args.low, args.high, args.seed, args.repeat, args.strings,
+                           args.sweep_max, args.check_max)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
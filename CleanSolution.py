@@ -1,8 +1,18 @@
-from graphics import *
 from PartialOrderings import *
+from PathCache import *
+from PathString import *
+from SweepResults import *
+from Predicates import *
+import numpy as np
 import random
-import copy
+import sys
+import collections
+import contextlib
+import functools
 import math
+import multiprocessing
+import os
+import pickle
 import time
 
 class Pt:
@@ -17,9 +27,12 @@ class Pt:
     def display(self, win, color="black", size=3):
         '''Display the point on a window'''
 
+        #graphics creates a Tk root on import so only load it to draw
+        from graphics import Point, Circle
+
         #Y coordinate flipped as graphics origin is top left corner
         point = Point(self.x, win.height - self.y)
-        cir = Circle(point)
+        cir = Circle(point, size)
         cir.setFill(color)
         cir.draw(win)
         return cir
@@ -36,6 +49,8 @@ class Pt:
 class LineSegment:
     '''Class for directed line segments in the plane'''
 
+    #Smallest signed area generatePoints and generatePointArrays allow
+    #between three points
     epsilon = 1e-2
 
     def __init__(self, pt1, pt2):
@@ -57,23 +72,23 @@ class LineSegment:
         minx = min(self.pt1.x, self.pt2.x)
         maxx = max(self.pt1.x, self.pt2.x)
         if (pt.x >= minx and pt.x <= maxx):
-            return abs(self.signedArea(pt)) <= self.epsilon
+            return self.orientation(pt) == 0
         return False;
 
     def orientation(self, pt):
-        '''Returns an int indicating whether pt is above or below the segment'''
+        '''Returns an int indicating whether pt is above or below the segment
 
-        value = self.signedArea(pt)
-        if (abs(value) <= self.epsilon):
-            return 0
-        elif (value < 0):
-            return -1
-        else:
-            return 1
+            Exact, see Predicates.orient2d
+        '''
+
+        return orient2d(self.pt1.x, self.pt1.y, self.pt2.x, self.pt2.y, pt.x, pt.y)
 
     def display(self, win, width=2):
         '''Display the directed segment on a window'''
 
+        #graphics creates a Tk root on import so only load it to draw
+        from graphics import Point, Line
+
         #Y coordinate flipped as graphics origin is top left corner
         p1 = Point(self.pt1.x, win.height - self.pt1.y)
         p2 = Point(self.pt2.x, win.height - self.pt2.y)
@@ -111,8 +126,214 @@ class LineSegment:
 
 
 
+#Segment pairs SegmentCrossingTable tests in one vectorized call
+CROSSING_CHUNK = 2**18
+
+class SegmentCrossingTable:
+    '''Table of which segments between points of a point set intersect
+
+        Every pair of segments whose endpoints are four distinct points is
+        tested once when the table is built, all at once with
+        VectorizedCrossings.intersections, which agrees exactly with
+        LineSegment.intersect. Row
+        a * n + b is an int used as a bitset, with bit c * n + d set when the
+        segment between points a and b intersects the segment between points
+        c and d, so a crossing query is a shift and a mask. Segments sharing
+        an endpoint are never marked as they always touch.
+    '''
+
+    def __init__(self, points):
+        '''Tests every pair of segments between the points'''
+
+        n = len(points)
+        vectorized = VectorizedCrossings(points)
+        starts, ends = np.triu_indices(n, 1)
+        first, second = np.triu_indices(len(starts), 1)
+        crosses = np.zeros((n * n, n * n), dtype=bool)
+        for chunk in range(0, len(first), CROSSING_CHUNK):
+            a = starts[first[chunk:chunk + CROSSING_CHUNK]]
+            b = ends[first[chunk:chunk + CROSSING_CHUNK]]
+            c = starts[second[chunk:chunk + CROSSING_CHUNK]]
+            d = ends[second[chunk:chunk + CROSSING_CHUNK]]
+            disjoint = (c != a) & (c != b) & (d != a) & (d != b)
+            a, b, c, d = a[disjoint], b[disjoint], c[disjoint], d[disjoint]
+            found = vectorized.intersections(a, b, c, d)
+            a, b, c, d = a[found], b[found], c[found], d[found]
+
+            #Mark both directions of both segments in each other's rows
+            for p, q in ((a, b), (b, a)):
+                for r, t in ((c, d), (d, c)):
+                    crosses[p * n + q, r * n + t] = True
+                    crosses[r * n + t, p * n + q] = True
+        rows = [int.from_bytes(np.packbits(row, bitorder="little").tobytes(), "little")
+                for row in crosses]
+        self.n = n
+        self.rows = rows
+        self.points = list(points)
+
+    def addPoint(self, point):
+        '''Adds a point with index n, testing only its new segments
+
+            The rows are re-spaced for the larger n, then each segment from
+            the new point is tested against every old segment, so adding a
+            point costs O(n^3) intersection tests rather than the O(n^4) of
+            building the table again.
+        '''
+
+        n = self.n
+        m = n + 1
+        mask = (1 << n) - 1
+        rows = [0] * (m * m)
+        for a in range(n):
+            for b in range(n):
+                row = self.rows[a * n + b]
+                spaced = 0
+                c = 0
+                while row:
+                    spaced |= (row & mask) << (c * m)
+                    row >>= n
+                    c += 1
+                rows[a * m + b] = spaced
+
+        points = self.points
+        for a in range(n):
+            line = LineSegment(points[a], point)
+            for c in range(n):
+                for d in range(c + 1, n):
+                    if c == a or d == a:
+                        continue
+                    if line.intersect(LineSegment(points[c], points[d])):
+                        bits = (1 << (c * m + d)) | (1 << (d * m + c))
+                        rows[a * m + n] |= bits
+                        rows[n * m + a] |= bits
+                        bits = (1 << (a * m + n)) | (1 << (n * m + a))
+                        rows[c * m + d] |= bits
+                        rows[d * m + c] |= bits
+        self.n = m
+        self.rows = rows
+        points.append(point)
+
+    def intersect(self, a, b, c, d):
+        '''Returns whether segment a to b intersects segment c to d'''
+
+        return (self.rows[a * self.n + b] >> (c * self.n + d)) & 1 == 1
+
+    def crossesPath(self, path, a, b):
+        '''Returns whether segment a to b intersects a segment of an index path'''
+
+        n = self.n
+        row = self.rows[a * n + b]
+        for j in range(len(path) - 1):
+            if (row >> (path[j] * n + path[j + 1])) & 1:
+                return True
+        return False
+
+    def crossesPathVia(self, path, a, via, b):
+        '''Returns whether the segments a to via and via to b intersect a
+        segment of an index path'''
+
+        return self.crossesPath(path, a, via) or self.crossesPath(path, via, b)
+
+
+class VectorizedCrossings:
+    '''Answers crossing queries against whole index paths with NumPy
+
+        Holds the point coordinates as arrays so the endpoints of every
+        segment of a path can be gathered into structure of arrays form and
+        tested against one or two new segments in a single vectorized
+        operation. Uses the same exact orientation predicate as
+        LineSegment.intersect and can be passed to pathStringIndexDP in place of a
+        SegmentCrossingTable.
+
+        A query costs a fixed couple of dozen NumPy calls however long the
+        path is, and paths have at most n-1 segments, so for the point sets
+        the solvers can handle this is slower than the table: about 15 to
+        20 times on 11 to 16 points. It avoids building the table, which
+        grows as n^4 bits.
+    '''
+
+    def __init__(self, points):
+        '''Copies the point coordinates into arrays'''
+
+        self.xs = np.array([p.x for p in points])
+        self.ys = np.array([p.y for p in points])
+
+    def addPoint(self, point):
+        '''Adds a point with the next index'''
+
+        self.xs = np.append(self.xs, point.x)
+        self.ys = np.append(self.ys, point.y)
+
+    def orientations(self, x1, y1, x2, y2, x, y):
+        '''Vectorized LineSegment.orientation of (x, y) against x1,y1 to x2,y2'''
+
+        return orient2dArrays(x1, y1, x2, y2, x, y)
+
+    def intersections(self, a, b, c, d):
+        '''Vectorized LineSegment.intersect of segments a to b against c to d
+
+            The four orientations of each pair are taken in one call, as
+            rows of a stacked array, since a call costs about the same
+            for a few segments as for many.
+
+            Arguments:
+                a, b, c, d: integer arrays of point indices of one shape
+
+            Returns:
+                A boolean array that is True where the segments intersect
+        '''
+
+        #Rows: c and d against a to b, then a and b against c to d
+        index = np.array(((a, a, c, c), (b, b, d, d), (c, d, a, b)))
+        xs = self.xs[index]
+        ys = self.ys[index]
+        orient = self.orientations(xs[0], ys[0], xs[1], ys[1], xs[2], ys[2])
+        crossing = (orient[0] != orient[1]) & (orient[2] != orient[3])
+
+        #A point on the other segment only needs checking when some
+        #orientation is colinear
+        if not orient.all():
+            within = ((orient == 0) & (xs[2] >= np.minimum(xs[0], xs[1])) &
+                      (xs[2] <= np.maximum(xs[0], xs[1])))
+            crossing |= within.any(axis=0)
+        return crossing
+
+    def crossesSegments(self, path, starts, ends):
+        '''Returns whether any of the segments starts[k] to ends[k]
+        intersects a segment of an index path it shares no endpoint with'''
+
+        path = np.frombuffer(bytes(path), dtype=np.uint8)
+        c = path[:-1]
+        d = path[1:]
+        a = np.array(starts)[:, None]
+        b = np.array(ends)[:, None]
+
+        #Only orient the pairs that can cross, the rest touch at a point
+        rows, columns = np.nonzero((c != a) & (c != b) & (d != a) & (d != b))
+        return bool(self.intersections(a[rows, 0], b[rows, 0],
+                                       c[columns], d[columns]).any())
+
+    def crossesPath(self, path, a, b):
+        '''Returns whether segment a to b intersects a segment of an index path'''
+
+        return self.crossesSegments(path, (a,), (b,))
+
+    def crossesPathVia(self, path, a, via, b):
+        '''Returns whether the segments a to via and via to b intersect a
+        segment of an index path'''
+
+        return self.crossesSegments(path, (a, via), (via, b))
+
+
 def generatePoints(x,y,n):
-    '''generates and returns n random non-degenerate points in [0,x) x [0,y)'''
+    '''generates and returns n random non-degenerate points in [0,x) x [0,y)
+
+        A point is kept when its y coordinate is new and its signed area
+        with every pair of earlier points is above LineSegment.epsilon, the
+        same rule as generatePointArrays. The exact predicates would accept
+        nearly colinear points, which are then only decided by rounding in
+        the input coordinates.
+    '''
 
     points = []
     lines = []
@@ -124,9 +345,9 @@ def generatePoints(x,y,n):
         if point.y in [p.y for p in points]:
             valid = False
         else:
-            #Check that the points are not colinear
+            #Check that the points are not nearly colinear
             for line in lines:
-                if line.contains(point):
+                if abs(line.signedArea(point)) <= LineSegment.epsilon:
                     valid = False;
                     break;
         if (valid):
@@ -135,16 +356,496 @@ def generatePoints(x,y,n):
             points.append(point)
     return points
 
+#Number of candidate point sets generatePointArrays tests at once
+POINT_BATCH_SIZE = 256
+
+def generatePointArrays(x, y, n, k, seed=None):
+    '''generates k independent sets of n random non-degenerate points in
+    [0,x) x [0,y) as a k by n by 2 array of coordinates
+
+        Whole batches of candidate sets are drawn with NumPy and a set is
+        kept when its y coordinates are distinct and no three of its points
+        have a signed area within LineSegment.epsilon, the same rule as
+        generatePoints, both tested for every set of the batch at once.
+        Rejected sets are drawn again.
+    '''
+
+    rng = np.random.default_rng(seed)
+    sets = [np.empty((0, n, 2))]
+    count = 0
+    while count < k:
+        batch = rng.uniform((0, 0), (x, y), size=(min(k - count, POINT_BATCH_SIZE), n, 2))
+
+        #Coordinates with one row per point index so gathers copy whole rows
+        xs = np.ascontiguousarray(batch[:, :, 0].T)
+        ys = np.ascontiguousarray(batch[:, :, 1].T)
+
+        #Check every set has unique y coordinates
+        valid = np.all(np.diff(np.sort(ys, axis=0), axis=0) != 0, axis=0)
+
+        #Check that no three points of a set are colinear, taking the signed
+        #area of points i, j and every later point for all sets at once
+        for i in range(n - 2):
+            dx = xs[i + 1:] - xs[i]
+            dy = ys[i + 1:] - ys[i]
+            for j in range(len(dx) - 1):
+                areas = dx[j] * dy[j + 1:] - dy[j] * dx[j + 1:]
+                valid &= np.all(np.abs(areas) > LineSegment.epsilon, axis=0)
+        sets.append(batch[valid])
+        count += len(sets[-1])
+    return np.concatenate(sets)
+
+def generatePointSets(x, y, n, k, seed=None):
+    '''generates and returns k independent lists of n random non-degenerate
+    points in [0,x) x [0,y), see generatePointArrays'''
+
+    return [[Pt(px, py) for px, py in points.tolist()]
+            for points in generatePointArrays(x, y, n, k, seed)]
+
 def display(points, lines, win):
-    '''displays a set of points and directed segments'''
+    '''displays a set of points and directed segments, updating the window
+    once when all are drawn'''
+
+    with win.batch():
+        for point in points:
+            point.display(win)
+        for line in lines:
+            line.display(win)
+
+
+def indexPathToSegments(points, path):
+    '''Builds the directed segments visited by an index path
+
+        Arguments:
+            points: the point set the path indexes into
+            path: a sequence of indices into points
+
+        Returns:
+            A list of LineSegments from each point of the path to the next
+    '''
+
+    return [LineSegment(points[path[j]], points[path[j + 1]])
+            for j in range(len(path) - 1)]
+
+def pathStringPartials(string):
+    '''Returns the PathStrings on one fewer point that string is built from
+
+        These are the subproblems used by Cases I, II and III of the dynamic
+        programming solvers, in the order they are used
+    '''
+
+    return string.partials()
+
+class SolverStats:
+    '''Counters collected by the dynamic programming solvers
+
+        Only filled in inside a solverStats() block. For each case it counts
+        the partial solutions tried, how many were accepted and rejected and
+        how many new segments were tested for crossings against a path. It
+        also counts subproblem cache hits and misses, and the strings solved
+        and seconds spent per level k, the number of points.
+    '''
+
+    CASES = ("I", "II", "III")
+
+    def __init__(self):
+        self.candidates = dict.fromkeys(self.CASES, 0)
+        self.accepted = dict.fromkeys(self.CASES, 0)
+        self.crossingQueries = dict.fromkeys(self.CASES, 0)
+        self.cacheHits = 0
+        self.cacheMisses = 0
+        self.levelStrings = {}
+        self.levelSeconds = {}
+
+    def record(self, case, candidates, accepted, crossings):
+        '''Adds the outcome of extending one subproblem under a case'''
+
+        self.candidates[case] += candidates
+        self.accepted[case] += accepted
+        self.crossingQueries[case] += crossings.take()
+
+    def rejected(self, case):
+        '''Returns the number of partial solutions rejected under a case'''
+
+        return self.candidates[case] - self.accepted[case]
+
+    def cacheHitRate(self):
+        '''Returns the fraction of subproblem lookups found in the cache'''
+
+        lookups = self.cacheHits + self.cacheMisses
+        return self.cacheHits / lookups if lookups else 0.0
+
+    def asDict(self):
+        '''Returns the counters as a dictionary, e.g. for json.dump'''
+
+        return {
+            "cases": {case: {"candidates": self.candidates[case],
+                             "accepted": self.accepted[case],
+                             "rejected": self.rejected(case),
+                             "crossingQueries": self.crossingQueries[case]}
+                      for case in self.CASES},
+            "cacheHits": self.cacheHits,
+            "cacheMisses": self.cacheMisses,
+            "cacheHitRate": self.cacheHitRate(),
+            "levels": {k: {"strings": self.levelStrings[k], "seconds": self.levelSeconds[k]}
+                       for k in sorted(self.levelStrings)},
+        }
+
+    def __repr__(self):
+        return "SolverStats(" + repr(self.asDict()) + ")"
+
+class CountingCrossings:
+    '''Wraps a crossing table to count the segments tested against paths'''
+
+    def __init__(self, crossings):
+        self.crossings = crossings
+        self.queries = 0
+
+    def crossesPath(self, path, a, b):
+        self.queries += 1
+        return self.crossings.crossesPath(path, a, b)
+
+    def crossesPathVia(self, path, a, via, b):
+        return self.crossesPath(path, a, via) or self.crossesPath(path, via, b)
+
+    def take(self):
+        '''Returns the queries counted since the last call and resets them'''
+
+        queries = self.queries
+        self.queries = 0
+        return queries
+
+#The SolverStats being filled in, None when instrumentation is off
+_solverStats = None
+
+@contextlib.contextmanager
+def solverStats():
+    '''Collects SolverStats from every solver call made inside the block
+
+        with solverStats() as stats:
+            levelSweep(points)
+        print(stats.asDict())
+
+        Outside such a block the solvers only check that no stats are being
+        collected once per string solved. Strings solved in levelSweep pool
+        workers are not counted.
+    '''
+
+    global _solverStats
+    previous = _solverStats
+    _solverStats = SolverStats()
+    try:
+        yield _solverStats
+    finally:
+        _solverStats = previous
+
+def extendIndexPaths(string, solved, crossings):
+    '''Finds the index paths satisfying string from those one point down
+
+        Adds the top point, index string.length, to every solution of the
+        subproblems given by pathStringPartials(string), all of which must
+        already be in solved
+
+        Arguments:
+            string: a PathString of length k-1
+            solved: dictionary holding the index paths of the subproblems
+            crossings: a SegmentCrossingTable or VectorizedCrossings for at
+                least the bottom k points
+
+        Returns:
+            The list of index paths satisfying string on the bottom k points
+    '''
+
+    stats = _solverStats
+    if stats is not None:
+        start = time.perf_counter()
+        crossings = CountingCrossings(crossings)
+    solutions = []
+    top = string.length
+
+    if top == 1:
+        if string.startsDown():
+            solutions.append(bytes((1, 0)))
+        else:
+            solutions.append(bytes((0, 1)))
+
+    #Case I: Paths that start at the top point
+    elif string.startsDown():
+        partialSolutions = solved[string.suffix()]
+        for path in partialSolutions:
+            if not crossings.crossesPath(path, top, path[0]):
+                solutions.append(bytes((top,)) + path)
+        if stats is not None:
+            stats.record("I", len(partialSolutions), len(solutions), crossings)
+
+    #Case II: Paths that end at the top point
+    if top > 1 and string.endsUp():
+        found = len(solutions)
+        partialSolutions = solved[string.prefix()]
+        for path in partialSolutions:
+            if not crossings.crossesPath(path, path[-1], top):
+                solutions.append(path + bytes((top,)))
+        if stats is not None:
+            stats.record("II", len(partialSolutions), len(solutions) - found, crossings)
+
+    #Case III: Paths where the top point is not an end point
+    #NOTE: Must be at an "UD" in the string
+    for i, up, down in string.valleyPartials():
+
+        #The top point replaces the edge corresponding to partial[i]
+        for partial in (up, down):
+            found = len(solutions)
+            partialSolutions = solved[partial]
+            for path in partialSolutions:
+                if not crossings.crossesPathVia(path, path[i], top, path[i + 1]):
+                    solutions.append(path[:i + 1] + bytes((top,)) + path[i + 1:])
+            if stats is not None:
+                stats.record("III", len(partialSolutions), len(solutions) - found,
+                             crossings)
+
+    if stats is not None:
+        stats.levelStrings[top + 1] = stats.levelStrings.get(top + 1, 0) + 1
+        stats.levelSeconds[top + 1] = (stats.levelSeconds.get(top + 1, 0.0) +
+                                       time.perf_counter() - start)
+    return solutions
+
+def pathStringIndexDP(points, string, solved, crossings=None):
+    '''Index based Dynamic Programming Solver for path string problem
+
+        Takes the same cases on where the top point can be in the sequence as
+        pathStringDP but stores every path as a bytes object of indices into
+        points rather than a list of LineSegments. A solution costs one byte
+        per point and extending it by the top point is a single concatenation.
+        Only points[:len(string) + 1] are used so subproblems share the
+        indices of the full point set.
+
+        Arguments:
+            points: a non degenerate set of n > 1 points, sorted by height
+            string: a PathString or string of length n-1 from {U,D}*
+            solved: dictionary from PathStrings to lists of index paths
+            crossings: a SegmentCrossingTable or VectorizedCrossings for the
+                points, a SegmentCrossingTable is built if not given
+
+        Returns:
+            solved, where solved[PathString(string)] holds every index path
+            satisfying the path string on the point set
+    '''
+
+    string = PathString(string)
+    if crossings is None:
+        crossings = SegmentCrossingTable(points[:string.length + 1])
+    for partial in pathStringPartials(string):
+        if partial not in solved:
+            if _solverStats is not None:
+                _solverStats.cacheMisses += 1
+            pathStringIndexDP(points, partial, solved, crossings)
+        elif _solverStats is not None:
+            _solverStats.cacheHits += 1
+    solved[string] = extendIndexPaths(string, solved, crossings)
+    return solved
+
+#Crossing table held by levelSweep worker processes
+_workerCrossings = None
+
+def _initLevelWorker(crossings):
+    '''Pool initializer giving a worker the crossing table of the sweep'''
+
+    global _workerCrossings
+    _workerCrossings = crossings
+
+def _extendWorkerStrings(task):
+    '''Solves a share of a level in a levelSweep worker from the pickled
+    previous level'''
+
+    level, strings = task
+    level = pickle.loads(level)
+    return [extendIndexPaths(string, level, _workerCrossings) for string in strings]
+
+#Levels with fewer strings than this are solved serially even with jobs > 1
+PARALLEL_LEVEL_SIZE = 256
+
+def levelJobs(jobs):
+    '''Returns jobs capped at the number of CPUs this process may run on, as
+    more processes than that only add overhead'''
+
+    if hasattr(os, "sched_getaffinity"):
+        return min(jobs, len(os.sched_getaffinity(0)))
+    return min(jobs, os.cpu_count() or 1)
+
+def levelPool(jobs, crossings):
+    '''Returns a pool of jobs processes holding crossings for sweepLevel'''
+
+    return multiprocessing.Pool(jobs, _initLevelWorker, (crossings,))
+
+def levelStrings(k):
+    '''Returns the 2^(k-1) PathStrings on k points in binary order with U
+    as 0 and D as 1'''
+
+    return PathString.level(k - 1)
+
+def levelSweep(points, crossings=None, jobs=1, cache=None, symmetric=True):
+    '''Solves every path string on a point set one level at a time
+
+        Level k holds the solutions of all 2^(k-1) path strings on the bottom
+        k points and only depends on level k-1, so levels are computed in
+        order k = 2..n and each is dropped once the next is finished. Peak
+        memory is two levels rather than every subproblem ever solved.
+
+        The strings of a level are independent of each other so with jobs > 1
+        each large level is split across a pool of that many processes. The
+        pool is started once, with the crossing table, and reused for every
+        level. Jobs are capped at the CPUs available, so on one CPU the
+        sweep is serial.
+
+        If a cache such as a DiskPathCache is given every solved string is
+        stored in it, and the sweep resumes from the highest level the cache
+        holds completely, only solving the strings it is missing.
+
+        Arguments:
+            points: a non degenerate set of n > 1 points, sorted by height
+            crossings: a SegmentCrossingTable or VectorizedCrossings for the
+                points, a SegmentCrossingTable is built if not given
+            jobs: number of processes to solve each level with
+            cache: dictionary like store of index paths kept between runs
+            symmetric: whether to solve only one string of each reverse
+                complement pair, see sweepLevel
+
+        Returns:
+            A PathStringDict from every PathString of length n-1, in binary
+            order with U as 0 and D as 1, to its list of index paths
+    '''
+
+    if crossings is None:
+        crossings = SegmentCrossingTable(points)
+    level = PathStringDict()
+    start = 2
+
+    #Resume from the highest level already in the cache
+    if cache is not None:
+        for k in range(len(points), 1, -1):
+            strings = levelStrings(k)
+            if all(string in cache for string in strings):
+                level = PathStringDict((string, cache[string]) for string in strings)
+                start = k + 1
+                break
+
+    jobs = levelJobs(jobs)
+    with contextlib.ExitStack() as stack:
+        pool = None
+        if jobs > 1 and 2 ** (len(points) - 2) >= PARALLEL_LEVEL_SIZE:
+            pool = stack.enter_context(levelPool(jobs, crossings))
+        for k in range(start, len(points) + 1):
+            level = sweepLevel(k, level, crossings, jobs, cache, symmetric, pool)
+    return level
+
+def sweepLevel(k, level, crossings, jobs=1, cache=None, symmetric=True, pool=None):
+    '''Solves level k of a levelSweep from level k-1
+
+        Walking a path backwards turns its string into the reverse
+        complement, so the paths of a string and of its reverse complement
+        are each other reversed. With symmetric set only the smaller string
+        of each such pair is solved and the other's paths are its paths
+        reversed, halving the strings extended.
+
+        With jobs > 1 a large level is split into one share of strings per
+        process. The previous level is pickled once and sent with each
+        share, so every worker receives it once per level.
+
+        Arguments:
+            k: the number of points of the new level
+            level: dictionary holding the index paths of every PathString
+                on k-1 points, empty for k = 2
+            crossings: a SegmentCrossingTable or VectorizedCrossings for at
+                least the bottom k points
+            jobs: number of processes to solve the level with
+            cache: dictionary like store of index paths kept between runs,
+                strings already in it are read instead of solved
+            symmetric: whether to derive reverse complements by reversal
+            pool: a levelPool of jobs processes for crossings, one is started
+                for this level if it's needed and not given
+
+        Returns:
+            A PathStringDict from every PathString on k points, in binary order,
+            to its list of index paths
+    '''
 
-    for point in points:
-        point.display(win)
-    for line in lines:
-        line.display(win)
+    strings = levelStrings(k)
+    if cache is not None:
+        missing = [string for string in strings if string not in cache]
+    else:
+        missing = strings
+
+    #A string is derived when its reverse complement is smaller, that one
+    #being solved here or already in the cache
+    if symmetric:
+        solve = [string for string in missing if string <= string.reverseComplement()]
+    else:
+        solve = missing
+
+    if jobs > 1 and len(solve) >= PARALLEL_LEVEL_SIZE:
+        with contextlib.ExitStack() as stack:
+            if pool is None:
+                pool = stack.enter_context(levelPool(jobs, crossings))
+
+            #One strided share of the strings per process
+            previous = pickle.dumps(level, pickle.HIGHEST_PROTOCOL)
+            shares = pool.map(_extendWorkerStrings,
+                [(previous, solve[i::jobs]) for i in range(jobs)], 1)
+        results = [None] * len(solve)
+        for i, share in enumerate(shares):
+            results[i::jobs] = share
+    else:
+        results = [extendIndexPaths(string, level, crossings) for string in solve]
+    solved = dict(zip(solve, results))
+    if len(solve) < len(missing):
+        for string in missing:
+            if string not in solved:
+                partner = string.reverseComplement()
+                paths = solved[partner] if partner in solved else cache[partner]
+                solved[string] = [path[::-1] for path in paths]
+
+    if cache is not None:
+        for string in missing:
+            cache[string] = solved[string]
+        return PathStringDict((string, solved[string] if string in solved else cache[string])
+                              for string in strings)
+    return PathStringDict((string, solved[string]) for string in strings)
+
+def addTopPoint(points, level, point, crossings, jobs=1):
+    '''Extends a solved point set by a new highest point
+
+        The DP only ever peels off the top point, so the solutions on the
+        old points stay valid and only the new level has to be solved. The
+        point is appended to points and added to crossings, so a point set
+        grows one point at a time at the cost of one level each instead of
+        a full levelSweep.
 
+        Arguments:
+            points: the point set level was solved on, sorted by height
+            level: the result of levelSweep, or of an earlier addTopPoint,
+                on points
+            point: the new point, above every point in points
+            crossings: the SegmentCrossingTable or VectorizedCrossings level
+                was solved with
+            jobs: number of processes to solve the new level with
+
+        Returns:
+            The level of every PathString on the grown point set
+    '''
 
-def pathStringDP(points, string, solved={}):
+    if any(p.y >= point.y for p in points):
+        raise ValueError("the new point must be above every point of the set")
+    points.append(point)
+    crossings.addPoint(point)
+    return sweepLevel(len(points), level, crossings, levelJobs(jobs))
+
+def sweepCounts(points, crossings=None, jobs=1):
+    '''Returns the number of solutions of every path string on a sorted
+    point set, in the order of levelSweep'''
+
+    return [len(paths) for paths in levelSweep(points, crossings, jobs).values()]
+
+def pathStringDP(points, string, solved=None, solver=None):
     '''Dynamic Programming Solver for path string problem
 
         Takes cases on where the top point can be in the sequence
@@ -154,173 +855,381 @@ def pathStringDP(points, string, solved={}):
         performance as we may have to solve an previous subcase as many as
         2^n times as we'd need to recalculate each path for the various blacklists
 
+        NOTE: The work is done on index paths as in pathStringIndexDP. Every
+        subproblem solved is added to solved as lists of LineSegments, and
+        subproblems already in solved are turned back into index paths
+        rather than solved again, so reusing solved across calls on one
+        point set shares the subproblems without any state kept elsewhere.
+        Each call still builds a SegmentCrossingTable. To solve many strings
+        on one point set, make one PathStringSolver and pass it, or call its
+        segments method, so the table is shared too. Only string itself is
+        then added to solved.
+
         Arguments:
             points: a non degenerate set of n > 1 points, sorted by height
-            string: a string of length n-1 from {U,D}*
+            string: a PathString or string of length n-1 from {U,D}*
+            solved: dictionary to add the solutions to, a new PathStringDict
+                if not given
+            solver: a PathStringSolver for points
 
         Returns:
-            Many paths satisfying the path string on the point set
+            solved, where solved[PathString(string)] holds every path
+            satisfying the path string on the point set
 
     '''
 
-    solved[string] = []
+    if solved is None:
+        solved = PathStringDict()
+    string = PathString(string)
+    if string in solved:
+        return solved
+    if solver is not None:
+        solved[string] = solver.segments(string)
+        return solved
+
+    crossings = SegmentCrossingTable(points[:string.length + 1])
+    indices = {id(p): i for i, p in enumerate(points)}
+    indexSolved = {}
+
+    def indexPaths(partial):
+        if partial in indexSolved:
+            return
+        if partial in solved:
+            indexSolved[partial] = [
+                bytes([indices[id(path[0].pt1)]] + [indices[id(line.pt2)] for line in path])
+                for path in solved[partial]]
+            return
+        for subproblem in pathStringPartials(partial):
+            indexPaths(subproblem)
+        paths = extendIndexPaths(partial, indexSolved, crossings)
+        indexSolved[partial] = paths
+        solved[partial] = [indexPathToSegments(points, path) for path in paths]
+
+    indexPaths(string)
+    return solved
+
+def pathStringDPWrapper(points, string, solved=None, inOrder=False, compact=False,
+        crossings=None):
+    '''A wrapper for the pathStringDP method
+
+        When compact is set solved holds index paths from pathStringIndexDP
+        rather than lists of LineSegments. Sweeps over many strings should
+        build one SegmentCrossingTable for the sorted points and pass it in.
+        A new PathStringDict is used for every call that doesn't pass one, so
+        the result can be indexed by text as well as by PathString. Use a
+        PathStringSolver to keep solutions for a point set around.
+    '''
+    if solved is None:
+        solved = PathStringDict()
+    if not inOrder:
+        points.sort(key=lambda p: p.y)
+    if compact:
+        return pathStringIndexDP(points, string, solved, crossings)
+    solver = PathStringSolver(points, None, True, crossings) if crossings is not None else None
+    sols = pathStringDP(points, string, solved, solver)
+    return sols
+
+class LazyPaths:
+    '''Memoized stream of the index paths produced by a generator
+
+        Paths are pulled from the generator only when some iteration first
+        reaches them and are kept for later iterations, so a subproblem
+        shared by several cases is solved at most once and only as far as
+        it is consumed. Once the stream is released no new iterations will
+        start, and while a single iteration is left it stops keeping the
+        paths it has passed.
+    '''
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.paths = []
+        self.start = 0
+        self.done = False
+        self.released = False
+        self.readers = 0
+
+    def __iter__(self):
+        i = self.start
+        self.readers += 1
+        try:
+            while True:
+                if self.released and self.readers == 1 and i > self.start:
+                    del self.paths[:i - self.start]
+                    self.start = i
+                if i - self.start < len(self.paths):
+                    yield self.paths[i - self.start]
+                    i += 1
+                elif self.done:
+                    return
+                else:
+                    try:
+                        self.paths.append(next(self.generator))
+                    except StopIteration:
+                        self.done = True
+        finally:
+            self.readers -= 1
+
+class PathStreams(dict):
+    '''The LazyPaths of the subproblems of one iterIndexPaths search, by
+    PathString
+
+        If uses is given, a count of how many times each subproblem will be
+        asked for, a stream is released and dropped from the dictionary as
+        its last use starts. Its paths are then freed as that use reads
+        them, once any earlier uses still reading it are done, instead of
+        being kept until the whole search ends.
+    '''
+
+    def __init__(self, uses=None):
+        dict.__init__(self)
+        self.uses = uses
+
+    @classmethod
+    def forString(cls, string):
+        '''Returns PathStreams counting the uses of every subproblem of string'''
+
+        uses = collections.Counter()
+        stack = [string]
+        seen = {string}
+        while stack:
+            for partial in stack.pop().partials():
+                uses[partial] += 1
+                if partial not in seen:
+                    seen.add(partial)
+                    stack.append(partial)
+        return cls(uses)
+
+def partialIndexPaths(partial, crossings, failed, streams):
+    '''Returns an iterator over the index paths of a subproblem for
+    iterIndexPaths, shared through streams when it is given'''
+
+    if streams is None:
+        return iterIndexPaths(partial, crossings, failed)
+    stream = streams.get(partial)
+    if stream is None:
+        stream = LazyPaths(iterIndexPaths(partial, crossings, failed, streams))
+        streams[partial] = stream
+    if streams.uses is not None:
+        streams.uses[partial] -= 1
+        if streams.uses[partial] == 0:
+            stream.released = True
+            del streams[partial]
+    return iter(stream)
+
+def iterIndexPaths(string, crossings, failed=None, streams=None):
+    '''Generates the index paths satisfying a PathString one at a time
+
+        Follows the cases of extendIndexPaths but draws the subproblem
+        solutions from nested generators instead of a solved dictionary.
+
+        If a set failed is given, strings found to have no solution are
+        added to it and strings already in it are skipped straight away. If
+        PathStreams are given, subproblems are shared through them, each
+        generated once. Without streams only one path per level of
+        recursion is held, but every subproblem is regenerated for each
+        case that uses it, which takes time exponential in the string
+        length.
+    '''
 
-    if len(string) == 1:
-        if string[0] == "U":
-            solved[string].append([LineSegment(points[0], points[1])])
+    if failed is not None and string in failed:
+        return
+    found = False
+    top = string.length
+    if top == 1:
+        if string.startsDown():
+            yield bytes((1, 0))
         else:
-            solved[string].append([LineSegment(points[1], points[0])])
+            yield bytes((0, 1))
         return
 
     #Case I: Paths that start at the top point
-    if string[0] == "D":
-
-        #Find all paths for n - 1 points (all but the top pt) satsifying string[1:]
-        partial = string[1:]
-        if (partial not in solved):
-            pathStringDP(points[:len(points) - 1], partial, solved)
-        partialsolutions = solved[partial]
-
-        #Try appending the top point to all subsolutions
-        for partialsol in partialsolutions:
-            partialsolution = copy.copy(partialsol)
-            startingpoint = partialsolution[0].pt1
-
-            #Ensure that the path starting at top point doesn't intersect itself
-            newLine = LineSegment(points[len(points) - 1], startingpoint)
-            valid = True
-            for i in range(1, len(partialsolution)):
-                if (partialsolution[i].intersect(newLine)):
-                    valid = False
-                    break;
-
-            #If no intersections add to solution dictionary
-            if (valid):
-                partialsolution.insert(0, newLine)
-                solved[string].append(partialsolution)
+    if string.startsDown():
+        for path in partialIndexPaths(string.suffix(), crossings, failed, streams):
+            if not crossings.crossesPath(path, top, path[0]):
+                found = True
+                yield bytes((top,)) + path
 
     #Case II: Paths that end at the top point
-    if string[len(string) - 1] == "U":
-
-        #Find all paths for n - 1 points (all but the top pt) satsifying string[:len(string)-1]
-        partial = string[:len(string) - 1]
-        if (partial not in solved):
-            pathStringDP(points[:len(points) - 1], partial, solved)
-        partialsolutions = solved[partial]
-
-        #Try appending the top point to all subsolutions
-        for partialsol in partialsolutions:
-            partialsolution = copy.copy(partialsol)
-
-            #Ensure that the path starting at top point doesn't intersect itself
-            endpoint = partialsolution[len(partialsolution) - 1].pt2
-            newLine = LineSegment(endpoint, points[len(points) - 1])
-            valid = True
-            for i in range(len(partialsolution) - 1):
-                if (partialsolution[i].intersect(newLine)):
-                    valid = False
-                    break;
-
-            #If no intersections add to solution dictionary
-            if (valid):
-                partialsolution.append(newLine)
-                solved[string].append(partialsolution)
+    if string.endsUp():
+        for path in partialIndexPaths(string.prefix(), crossings, failed, streams):
+            if not crossings.crossesPath(path, path[-1], top):
+                found = True
+                yield path + bytes((top,))
 
     #Case III: Paths where the top point is not an end point
-    #NOTE: Must be at an "UD" in the string
-    for i in range(0, len(string) - 1):
-
-        #Find all occurences of "UD"
-        if string[i] == "U":
-            if string[i + 1] == "D":
-
-                #Have to consider appending top point to solutions to two path strings
-                partial1 = string[:i] + "U" + string[i + 2:]
-                partial2 = string[:i] + "D" + string[i + 2:]
-
-                #Find all paths for n - 1 points (all but the top pt) satsifying partial1
-                if partial1 not in solved:
-                    pathStringDP(points[:len(points) - 1], partial1, solved)
-                partialSolutions = solved[partial1]
-
-                #Try adding the top point
-                for partialsol in partialSolutions:
-                    partialSolution = copy.copy(partialsol)
-                    #Remove edge corresponding to partial1[i]
-                    oldLine = partialSolution.pop(i);
-
-                    #Check if adding top point causes path to intersect itself
-                    newLine1 = LineSegment(oldLine.pt1, points[-1])
-                    newLine2 = LineSegment(points[-1], oldLine.pt2)
-                    valid = True;
-                    for j in range(i - 1):
-                        if (newLine1.intersect(partialSolution[j]) or
-                            newLine2.intersect(partialSolution[j])):
-                            valid = False;
-                            break;
-                    if valid and i > 0 and partialSolution[i-1].intersect(newLine2):
-                        valid = False
-                    if valid and i < len(partialSolution) and partialSolution[i].intersect(newLine1):
-                        valid = False
-                    if valid:
-                        for j in range(i + 1, len(partialSolution)):
-                            if (newLine1.intersect(partialSolution[j]) or
-                                newLine2.intersect(partialSolution[j])):
-                                valid = False;
-                                break;
-
-                    #If no intersections add to solution dictionary
-                    if valid:
-                        partialSolution.insert(i, newLine1)
-                        partialSolution.insert(i + 1, newLine2)
-                        solved[string].append(partialSolution)
-
-                #Find all paths for n - 1 points (all but the top pt) satsifying partial2
-                if partial2 not in solved:
-                    pathStringDP(points[:len(points) - 1], partial2, solved)
-                partialSolutions = solved[partial2]
-
-                #Try adding the top point
-                for partialsol in partialSolutions:
-                    partialSolution = copy.copy(partialsol)
-
-                    #Remove edge corresponding to partial2[i]
-                    oldLine = partialSolution.pop(i);
-
-                    #Check if adding top point causes path to intersect itself
-                    newLine1 = LineSegment(oldLine.pt1, points[-1])
-                    newLine2 = LineSegment(points[-1], oldLine.pt2)
-                    valid = True;
-                    for j in range(i - 1):
-                        if (newLine1.intersect(partialSolution[j]) or
-                            newLine2.intersect(partialSolution[j])):
-                            valid = False;
-                            break;
-                    if valid and i > 0 and partialSolution[i-1].intersect(newLine2):
-                        valid = False
-                    if valid and i < len(partialSolution) and partialSolution[i].intersect(newLine1):
-                        valid = False
-                    if valid:
-                        for j in range(i + 1, len(partialSolution)):
-                            if (newLine1.intersect(partialSolution[j]) or
-                                newLine2.intersect(partialSolution[j])):
-                                valid = False;
-                                break;
-
-                    #If no intersections add to solution dictionary
-                    if valid:
-                        partialSolution.insert(i, newLine1)
-                        partialSolution.insert(i + 1, newLine2)
-                        solved[string].append(partialSolution)
-                i += 1
-                return solved
-
-def pathStringDPWrapper(points, string, solved={}, inOrder=False):
-    '''A wrapper for the pathStringDP method'''
+    for i, up, down in string.valleyPartials():
+        for partial in (up, down):
+            for path in partialIndexPaths(partial, crossings, failed, streams):
+                if not crossings.crossesPathVia(path, path[i], top, path[i + 1]):
+                    found = True
+                    yield path[:i + 1] + bytes((top,)) + path[i + 1:]
+    if not found and failed is not None:
+        failed.add(string)
+
+def iterSolutions(points, string, inOrder=False, crossings=None, shared=True):
+    '''Lazily generates the solutions of a path string on a point set
+
+        Yields the same index paths in the same order as pathStringIndexDP,
+        without ever holding the paths of string itself. Use
+        indexPathToSegments to turn a path into LineSegments.
+
+        With shared set, subproblems are generated once through PathStreams
+        and only as far as the paths taken so far need, so the first few
+        come quickly and all of them take about as long as
+        pathStringIndexDP. A subproblem keeps the paths read from it until
+        every string using it has started on it, so memory is bounded by
+        the lower levels pathStringIndexDP would store, less the
+        subproblems already used up, not by the recursion depth.
+
+        With shared unset nothing is kept but one path per level of the
+        recursion, so memory is bounded by the string length, but each
+        subproblem is regenerated for every case using it and the time
+        grows exponentially with the string length. Only practical for
+        short strings or when just the first few paths are wanted.
+
+        Arguments:
+            points: a non degenerate set of n > 1 points, sorted in place
+                by height unless inOrder is set
+            string: a PathString or string of length n-1 from {U,D}*
+            inOrder: whether points are already sorted by height
+            crossings: a SegmentCrossingTable or VectorizedCrossings for the
+                points, a SegmentCrossingTable is built if not given
+            shared: whether to generate each subproblem once
+    '''
+
+    string = PathString(string)
     if not inOrder:
         points.sort(key=lambda p: p.y)
-    sols = pathStringDP(points, string, solved)
-    return sols
+    if crossings is None:
+        crossings = SegmentCrossingTable(points[:string.length + 1])
+    streams = PathStreams.forString(string) if shared else None
+    yield from iterIndexPaths(string, crossings, None, streams)
+
+def hasSolution(points, string, inOrder=False, crossings=None, failed=None):
+    '''Returns whether a path string has a solution on a point set
+
+        Searches depth first through the same cases as pathStringIndexDP and
+        stops at the first valid path. Within a call subproblems are only
+        solved as far as the search reaches into them. Between calls only
+        subproblems without a solution are remembered, in the set failed
+        which can be shared between calls on the same point set.
+
+        Arguments:
+            points: a non degenerate set of n > 1 points, sorted in place
+                by height unless inOrder is set
+            string: a PathString or string of length n-1 from {U,D}*
+            inOrder: whether points are already sorted by height
+            crossings: a SegmentCrossingTable or VectorizedCrossings for the
+                points, a SegmentCrossingTable is built if not given
+            failed: set of PathStrings known to have no solution
+    '''
+
+    string = PathString(string)
+    if not inOrder:
+        points.sort(key=lambda p: p.y)
+    if crossings is None:
+        crossings = SegmentCrossingTable(points[:string.length + 1])
+    if failed is None:
+        failed = set()
+    for path in iterIndexPaths(string, crossings, failed, PathStreams()):
+        return True
+    return False
+
+class PathStringSolver:
+    '''Solves path strings on one point set with a bounded subproblem cache
+
+        The solver owns its points, their SegmentCrossingTable and a cache
+        from PathStrings to index paths, so solutions are never shared
+        between point sets. The cache is kept under maxBytes by evicting the
+        least recently used strings, which are solved again if they are
+        needed later.
+    '''
+
+    def __init__(self, points, maxBytes=256 * 2**20, inOrder=False, crossings=None):
+        '''Create a solver for a non degenerate set of points
+
+            Arguments:
+                points: the point set, sorted by height if inOrder is set
+                maxBytes: approximate memory budget of the cache, None for
+                    no limit
+                inOrder: whether points are already sorted by height
+                crossings: a SegmentCrossingTable or VectorizedCrossings for
+                    the sorted points, a SegmentCrossingTable is built if
+                    not given
+        '''
+
+        if not inOrder:
+            points = sorted(points, key=lambda p: p.y)
+        if crossings is None:
+            crossings = SegmentCrossingTable(points)
+        self.points = points
+        self.crossings = crossings
+        self.maxBytes = maxBytes
+        self.cache = collections.OrderedDict()
+        self.cacheBytes = 0
+
+    def solve(self, string):
+        '''Returns the index paths satisfying a path string of length at
+        most n-1 on the bottom len(string) + 1 points'''
+
+        string = PathString(string)
+        if string in self.cache:
+            if _solverStats is not None:
+                _solverStats.cacheHits += 1
+            self.cache.move_to_end(string)
+            return self.cache[string][0]
+        if _solverStats is not None:
+            _solverStats.cacheMisses += 1
+
+        #Hold the subproblems locally as solving one may evict another
+        partials = {}
+        for partial in pathStringPartials(string):
+            partials[partial] = self.solve(partial)
+        paths = extendIndexPaths(string, partials, self.crossings)
+
+        size = sys.getsizeof(paths) + sum(sys.getsizeof(path) for path in paths)
+        self.cache[string] = (paths, size)
+        self.cacheBytes += size
+        while self.maxBytes is not None and self.cacheBytes > self.maxBytes and self.cache:
+            evicted, (evictedPaths, evictedSize) = self.cache.popitem(last=False)
+            self.cacheBytes -= evictedSize
+        return paths
+
+    def addTopPoint(self, point):
+        '''Adds a new highest point and solves the new level
+
+            Everything in the cache stays valid as solutions never use
+            points above their string's top point. The new level is built
+            from the cached top level, so growing the set by a point costs
+            one level of the DP when that level is still cached.
+
+            Returns:
+                A PathStringDict from every PathString on the grown point set
+                to its index paths
+        '''
+
+        if any(p.y >= point.y for p in self.points):
+            raise ValueError("the new point must be above every point of the set")
+        self.points = self.points + [point]
+        self.crossings.addPoint(point)
+        return PathStringDict((string, self.solve(string)) for string in levelStrings(len(self.points)))
+
+    def count(self, string):
+        '''Returns the number of paths satisfying a path string'''
+
+        return len(self.solve(string))
+
+    def segments(self, string):
+        '''Returns the paths satisfying a path string as lists of LineSegments'''
+
+        return [indexPathToSegments(self.points, path) for path in self.solve(string)]
+
+    def clear(self):
+        '''Empties the subproblem cache'''
+
+        self.cache.clear()
+        self.cacheBytes = 0
+
 
 def randomPathString(n):
     '''Randomly generate a path string of length n'''
@@ -333,79 +1242,184 @@ def randomPathString(n):
             string += "D"
     return string
 
-def generateAllPathStrings(n, filename, points=None):
+def generateAllPathStrings(n, filename, points=None, jobs=1, cacheDirectory=None):
     '''Generates n points and then solves all path strings and writes to the
-    results to a file'''
+    results to a file, using jobs processes for each level of the sweep
 
-    f = open(filename, 'a')
+        A filename ending in .npz gets a columnar ResultsWriter file with the
+        counts indexed by PathString bits, any other filename has a
+        "string, count" line per string appended to it
+
+        If cacheDirectory is given solved subproblems are kept in a
+        DiskPathCache there, so an interrupted run on the same points resumes
+        where it stopped
+    '''
 
     if points == None:
         points = generatePoints(1000, 1000, n)
 
     points.sort(key=lambda p: p.y)
-    solved = {}
-    for i in range(int(math.pow(2, n - 1))):
-        if (i % 20 == 0):
-            print(i)
-        string = "{0:b}".format(i)
-        string = "0" * (n - 1 - len(string)) + string
-        string = string.replace("0", "U")
-        string = string.replace("1", "D")
-        f.write(string + ", " + str(len(pathStringDPWrapper(points, string, \
-            solved, True)[string])) + "\n")
+    cache = None
+    if cacheDirectory is not None:
+        cache = DiskPathCache(cacheDirectory, points)
+    level = levelSweep(points, jobs=jobs, cache=cache)
+    if cache is not None:
+        cache.close()
+
+    if filename.endswith(".npz"):
+        counts = np.fromiter((len(paths) for paths in level.values()), np.int64, len(level))
+        with ResultsWriter(filename, len(points), kind="generateAllPathStrings") as writer:
+            writer.addTrial(counts, points)
+        return
+
+    f = open(filename, 'a')
+    for string, paths in level.items():
+        f.write(str(string) + ", " + str(len(paths)) + "\n")
     f.close()
 
-def bunchOfTrials(n, numPoints, filename):
+def displayUnsolved(points, string):
+    '''Shows a point set on which a path string has no solution and waits
+    for enter'''
+
+    from graphics import GraphWin
+    win = GraphWin("Path String", 1000,1000)
+    print(string)
+    display(points, [], win)
+    input()
+
+def displaySolutions(points, string, paths=None, columns=None, cellSize=None):
+    '''Shows the solutions of a path string as a grid of small multiples
+
+        Every index path is drawn over the point set in a cell of its own,
+        scaled to fit, with the point it starts at in red. The whole grid
+        is drawn in one batch so the window is updated once rather than
+        for every point and segment.
+
+        Arguments:
+            points: a non degenerate set of n > 1 points, sorted by height
+            string: a PathString or string of length n-1 from {U,D}*
+            paths: the index paths to draw, solved with pathStringIndexDP
+                if not given
+            columns: cells per row, enough for a square grid by default
+            cellSize: width and height of a cell in pixels, by default the
+                largest that fits the grid in a 1000 pixel window
+
+        Returns:
+            The GraphWin the grid is drawn in
+    '''
+
+    #graphics creates a Tk root on import so only load it to draw
+    from graphics import GraphWin, Point, Circle, Line, Rectangle
+
+    string = PathString(string)
+    used = points[:string.length + 1]
+    if paths is None:
+        paths = pathStringIndexDP(points, string, {})[string]
+    if columns is None:
+        columns = max(1, math.ceil(math.sqrt(len(paths))))
+    rows = max(1, -(-len(paths) // columns))
+    if cellSize is None:
+        cellSize = max(40, 1000 // max(columns, rows))
+    win = GraphWin(str(string) + ": " + str(len(paths)) + " solutions",
+                   columns * cellSize, rows * cellSize)
+
+    #Same scale on both axes, Y flipped as graphics origin is top left corner
+    margin = cellSize / 10
+    lowX = min(p.x for p in used)
+    lowY = min(p.y for p in used)
+    span = max(max(p.x for p in used) - lowX, max(p.y for p in used) - lowY) or 1
+    scale = (cellSize - 2 * margin) / span
+
+    objects = []
+    for k, path in enumerate(paths):
+        row, column = divmod(k, columns)
+        left = column * cellSize
+        bottom = (row + 1) * cellSize
+        cell = [Point(left + margin + (p.x - lowX) * scale,
+                      bottom - margin - (p.y - lowY) * scale) for p in used]
+
+        border = Rectangle(Point(left, bottom - cellSize), Point(left + cellSize - 1, bottom - 1))
+        border.setOutline("gray")
+        objects.append(border)
+        for j in range(len(path) - 1):
+            line = Line(cell[path[j]], cell[path[j + 1]])
+            line.setArrow("last")
+            objects.append(line)
+        for i, point in enumerate(cell):
+            cir = Circle(point, 2)
+            cir.setFill("red" if i == path[0] else "black")
+            objects.append(cir)
+
+    win.drawAll(objects)
+    return win
+
+def bunchOfTrials(n, numPoints, filename, jobs=1, seed=None):
     '''Initializes n points sets and solves them for all path strings and
-    writes the results to a file'''
+    writes the results to a file, seed fixes the point sets
+
+        The point sets are independent so with jobs > 1 they are swept in a
+        pool of that many processes and the per string counts are merged
+        afterwards, giving the same file as a serial run
+
+        A filename ending in .npz gets a columnar ResultsWriter file holding
+        every trial's counts, each written as soon as its sweep finishes.
+        Any other filename has a "string, max, bound" line per string
+        appended to it.
+    '''
 
-    f = open(filename, 'a')
     pointSets = []
-    solvedSets = []
-    output, successful = hullJumpingRecursive(tempPoints, p, tempString)
 
-    #Initialize point sets and solved dictionaries
-    for i in range(n):
-        points = generatePoints(1000, 1000, numPoints)
+    #Initialize point sets
+    for points in generatePointSets(1000, 1000, numPoints, n, seed):
         points.sort(key=lambda p: p.y)
         pointSets.append(points)
-        solvedSets.append({})
 
     #Solve all path strings for each points set
+    with contextlib.ExitStack() as stack:
+        if jobs > 1:
+            pool = stack.enter_context(multiprocessing.Pool(jobs))
+            countSets = pool.imap(sweepCounts, pointSets)
+        else:
+            countSets = map(sweepCounts, pointSets)
+
+        if filename.endswith(".npz"):
+            with ResultsWriter(filename, numPoints, len(pointSets), seed,
+                               kind="bunchOfTrials") as writer:
+                for points, counts in zip(pointSets, countSets):
+
+                    #If there is no solution display the point set
+                    for i in np.flatnonzero(np.asarray(counts) == 0).tolist():
+                        displayUnsolved(points, PathString(i, numPoints - 1))
+                    writer.addTrial(counts, points)
+            return
+        countSets = list(countSets)
+
+    f = open(filename, 'a')
+
+    #Upper bounds for every string at once, indexed like the counts
+    bounds = partialOrderingsTable(numPoints)
+
     for i in range(int(math.pow(2, numPoints - 1))):
-        print(i)
-        string = "{0:b}".format(i)
-        string = "0" * (numPoints - 1 - len(string)) + string
-        string = string.replace("0", "U")
-        string = string.replace("1", "D")
+        string = PathString(i, numPoints - 1)
         arr = []
-        for i in range(len(pointSets)):
-            solved = pathStringDPWrapper(pointSets[i], string, solvedSets[i], True)
-            arr.append(len(solved[string]))
+        for j in range(len(pointSets)):
+            arr.append(countSets[j][i])
 
             #If there is no solution display the point set
-            if (len(solved[string]) == 0):
-                win = GraphWin("Path String", 1000,1000)
-                print(string)
-                display(pointSet[i], [], win)
-                input()
+            if (countSets[j][i] == 0):
+                displayUnsolved(pointSets[j], string)
 
-        f.write(string + ", " + str(max(arr)) + ", " + str(partialOrderings(string, {})) + "\n")
+        f.write(str(string) + ", " + str(max(arr)) + ", " + str(bounds[i]) + "\n")
     f.close()
 
-def nonIntersectingPaths(n):
+def nonIntersectingPaths(n, jobs=1):
     '''Gives lower bound for the number of non intersecting paths on n points'''
 
     total = 0
     points = generatePoints(1000, 1000, n)
     points.sort(key=lambda p: p.y)
-    solved = {}
-    for i in range(int(math.pow(2, n - 1))):
-        string = "{0:b}".format(i)
-        string = "0" * (n - 1 - len(string)) + string
-        string = string.replace("0", "U")
-        string = string.replace("1", "D")
-        total += len(pathStringDPWrapper(points, string, solved,True)[string])
+    for paths in levelSweep(points, jobs=jobs).values():
+        total += len(paths)
     return total
 
 def generateConvexPoints(n, r=100):
@@ -422,35 +1436,92 @@ def generateConvexPoints(n, r=100):
             thetas.append(theta)
     return points
 
+def monotoneChainHull(points):
+    '''Andrew's monotone chain convex hull algorithm
+
+        Sorts indices rather than the points, so the input is left untouched.
+        Colinear points on the boundary are left out.
+
+        Returns:
+            The indices into points of the hull vertices in counterclockwise
+            order starting from the leftmost point
+    '''
+
+    order = sorted(range(len(points)), key=lambda i: (points[i].x, points[i].y))
+    if len(order) < 3:
+        return order
+
+    #Build the lower hull left to right then the upper hull right to left
+    chains = []
+    for indices in (order, order[::-1]):
+        chain = []
+        for i in indices:
+            p3 = points[i]
+            while len(chain) >= 2:
+                p1 = points[chain[-2]]
+                p2 = points[chain[-1]]
+                if orient2d(p1.x, p1.y, p2.x, p2.y, p3.x, p3.y) > 0:
+                    break
+                chain.pop()
+            chain.append(i)
+        chains.append(chain)
+    return chains[0][:-1] + chains[1][:-1]
+
+def convexHullArrays(pointSets):
+    '''Monotone chain convex hulls of many point sets at once
+
+        Runs the chains of every set in lock step, so each step is one
+        vectorized orientation test over all the sets.
+
+        Arguments:
+            pointSets: a k by n by 2 array of coordinates, such as from
+                generatePointArrays
+
+        Returns:
+            A list of k arrays of indices of hull vertices, counterclockwise
+            from the leftmost point as in monotoneChainHull
+    '''
+
+    pointSets = np.asarray(pointSets, dtype=float)
+    k, n = pointSets.shape[:2]
+    order = np.lexsort((pointSets[:, :, 1], pointSets[:, :, 0]), axis=-1)
+    xs = np.take_along_axis(pointSets[:, :, 0], order, axis=1)
+    ys = np.take_along_axis(pointSets[:, :, 1], order, axis=1)
+    if n < 3:
+        return list(order)
+
+    rows = np.arange(k)
+    chains = []
+    for positions in (range(n), range(n - 1, -1, -1)):
+        chain = np.zeros((k, n), dtype=np.intp)
+        sizes = np.zeros(k, dtype=np.intp)
+        for t in positions:
+            while True:
+                active = rows[sizes >= 2]
+                p1 = chain[active, sizes[active] - 2]
+                p2 = chain[active, sizes[active] - 1]
+                turns = orient2dArrays(xs[active, p1], ys[active, p1], xs[active, p2],
+                                       ys[active, p2], xs[active, t], ys[active, t])
+                pop = active[turns <= 0]
+                if len(pop) == 0:
+                    break
+                sizes[pop] -= 1
+            chain[rows, sizes] = t
+            sizes += 1
+        chains.append((chain, sizes))
+
+    (lower, lowerSizes), (upper, upperSizes) = chains
+    return [order[i, np.concatenate((lower[i, :lowerSizes[i] - 1], upper[i, :upperSizes[i] - 1]))]
+            for i in range(k)]
+
 def convexHull(points,sortedByY=False):
-    '''Grahm Scan convex hull algorithm'''
-
-    if (len(points) < 4):
-        return points
-    bottom = points[0]
-    if not sortedByY:
-        for i in range(1,len(points)):
-            if points[i].y < bottom.y:
-                bottom = points[i]
-    points.remove(bottom)
-    points.sort(key=lambda p: -1 * (p.x - bottom.x)/(p.y - bottom.y))
-    points.append(bottom)
-    stack = [bottom, points[0]]
-    for cur in range(1, len(points)):
-        stack.append(points[cur])
-        p3 = stack.pop()
-        p2 = stack.pop()
-        p1 = stack.pop()
-        signedArea = (p2.x - p1.x)*(p3.y - p1.y) - (p2.y - p1.y)*(p3.x - p1.x)
-        while signedArea <= 0:
-            p2 = p1
-            p1 = stack.pop()
-            signedArea = (p2.x - p1.x)*(p3.y - p1.y) - (p2.y - p1.y)*(p3.x - p1.x)
-        stack.append(p1)
-        stack.append(p2)
-        stack.append(p3)
-    stack.pop()
-    return stack
+    '''Returns the points on the convex hull in counterclockwise order
+
+        Uses monotoneChainHull so the input is not modified. sortedByY is
+        no longer needed and only kept for existing callers.
+    '''
+
+    return [points[i] for i in monotoneChainHull(points)]
 
 def jarvisMarchSinglePass(points, point):
     '''A single iteration of Jarvis march'''
@@ -460,89 +1531,360 @@ def jarvisMarchSinglePass(points, point):
     prevPoint = point
     prevSegment = LineSegment(point, point)
     for p in points:
-        if (nextPoint == point or nextSegment.signedArea(p) > 0):
+        if (nextPoint == point or nextSegment.orientation(p) > 0):
             nextPoint = p
             nextSegment.pt2 = p
-        if (prevPoint == point or prevSegment.signedArea(p) < 0):
+        if (prevPoint == point or prevSegment.orientation(p) < 0):
             prevPoint = p
             prevSegment.pt2 = p
     return [nextPoint, prevPoint]
 
-def hullJumping(points, string, hull=None):
-    '''A wrapper for the hull jumping algorithm'''
+class RadialOrder:
+    '''The other points sorted counterclockwise around each point
+
+        Built once per point set, with the angles sorted in floating point
+        and then checked and repaired with exact orientation tests. Hull
+        neighbour and visibility queries over a subset of the points walk
+        these orders and skip the points outside the subset instead of
+        rescanning the whole set.
+
+        A subset is given either as an integer bitmask over the point
+        indices or as a sequence of booleans indexed the same way.
+    '''
+
+    def __init__(self, points):
+        '''Sort the points around every point'''
+
+        n = len(points)
+        self.xs = xs = [p.x for p in points]
+        self.ys = ys = [p.y for p in points]
+        x = np.array(xs)
+        y = np.array(ys)
+        dx = x[None, :] - x[:, None]
+        dy = y[None, :] - y[:, None]
+
+        #Angles start just after straight down, so the half plane of a
+        #direction is 0 below the center or straight right and 1 otherwise
+        angles = np.arctan2(dy, dx)
+        np.fill_diagonal(angles, np.inf)
+        distances = dx * dx + dy * dy
+        order = np.lexsort((distances, angles), axis=1)[:, :-1] if n > 1 else np.zeros((n, 0), int)
+        half = ~((dy < 0) | ((dy == 0) & (dx > 0)))
+
+        #Check each adjacent pair exactly and re-sort the rows that fail
+        self.order = []
+        for c in range(n):
+            row = order[c]
+            if n > 2:
+                p = row[:-1]
+                q = row[1:]
+                turns = orient2dArrays(xs[c], ys[c], x[p], y[p], x[q], y[q])
+                inOrder = ((half[c, p] < half[c, q])
+                           | ((half[c, p] == half[c, q])
+                              & ((turns > 0) | ((turns == 0) & (distances[c, p] <= distances[c, q])))))
+                if not inOrder.all():
+                    row = sorted(row.tolist(), key=functools.cmp_to_key(
+                        lambda p, q, c=c: self.compare(c, p, q)))
+            self.order.append(list(map(int, row)))
+
+        self.rank = [dict((q, k) for k, q in enumerate(row)) for row in self.order]
+
+    def compare(self, c, p, q):
+        '''Exact comparison of p and q in the counterclockwise order around c'''
+
+        xs = self.xs
+        ys = self.ys
+        halfP = not (ys[p] < ys[c] or (ys[p] == ys[c] and xs[p] > xs[c]))
+        halfQ = not (ys[q] < ys[c] or (ys[q] == ys[c] and xs[q] > xs[c]))
+        if halfP != halfQ:
+            return -1 if halfQ else 1
+        turn = orient2d(xs[c], ys[c], xs[p], ys[p], xs[q], ys[q])
+        if turn != 0:
+            return -turn
+        distanceP = (xs[p] - xs[c]) ** 2 + (ys[p] - ys[c]) ** 2
+        distanceQ = (xs[q] - xs[c]) ** 2 + (ys[q] - ys[c]) ** 2
+        return (distanceP > distanceQ) - (distanceP < distanceQ)
+
+    @staticmethod
+    def member(subset):
+        '''Returns a membership test for a bitmask or boolean sequence'''
+
+        if isinstance(subset, int):
+            return lambda i: subset >> i & 1
+        return subset.__getitem__
+
+    def walk(self, c, subset, start=None):
+        '''Generates the points of subset counterclockwise around c
+
+            Starts just after start, or at the beginning of the order if it
+            is None, and goes once around.
+        '''
+
+        row = self.order[c]
+        first = 0 if start is None else self.rank[c][start] + 1
+        inSubset = self.member(subset)
+        for k in range(first, first + len(row)):
+            q = row[k % len(row)]
+            if q != start and inSubset(q):
+                yield q
+
+    def between(self, c, start, end, subset):
+        '''Returns the points of subset strictly between start and end
+        counterclockwise around c
+
+            These are the points of subset visible from c in the wedge
+            swept from the ray through start to the ray through end, in the
+            order they are swept.
+        '''
+
+        row = self.order[c]
+        rank = self.rank[c]
+        first = rank[start] + 1
+        last = rank[end]
+        if last < first:
+            last += len(row)
+        inSubset = self.member(subset)
+        out = []
+        for k in range(first, last):
+            q = row[k % len(row)]
+            if inSubset(q):
+                out.append(q)
+        return out
+
+    def hullNeighbors(self, c, subset):
+        '''Finds the hull neighbours of c in the hull of subset and c
+
+            Walks the subset around c looking for an angular gap of more
+            than half a turn, which exists exactly when c is a hull vertex.
+            Like monotoneChainHull, a point in the middle of a hull edge is
+            not a vertex.
+
+            Returns:
+                (next, prev) with every point of subset left of c to next
+                and right of c to prev, or None if c is not a hull vertex
+        '''
+
+        xs = self.xs
+        ys = self.ys
+        members = [q for q in self.walk(c, subset) if q != c]
+        if not members:
+            return None
+        if len(members) == 1:
+            return members[0], members[0]
+        for k in range(len(members)):
+            p = members[k - 1]
+            q = members[k]
+            turn = orient2d(xs[c], ys[c], xs[p], ys[p], xs[q], ys[q])
+            if turn < 0:
+
+                #Points sharing the ray through q are ordered nearest first
+                #and only the furthest is a vertex
+                for r in members[k + 1:]:
+                    if (orient2d(xs[c], ys[c], xs[q], ys[q], xs[r], ys[r]) != 0
+                            or (xs[q] - xs[c]) * (xs[r] - xs[c]) + (ys[q] - ys[c]) * (ys[r] - ys[c]) < 0):
+                        break
+                    q = r
+                return q, p
+        return None
+
+class DeletionHull:
+    '''Convex hull of a point set that supports deleting hull vertices
+
+        The hull is kept as a counterclockwise doubly linked list of point
+        indices. Deleting a vertex can only expose points inside the
+        triangle it forms with its two neighbours, so only those are
+        searched for the new chain, and those are read off the radial order
+        around a neighbour already sorted. Every change is written to a
+        journal so snapshot and rollback give cheap backtracking without
+        copying the point set.
+    '''
+
+    def __init__(self, points, radial=None):
+        '''Build the hull of a non degenerate set of points, reusing the
+        RadialOrder of the points if one is given'''
+
+        n = len(points)
+        if radial is None:
+            radial = RadialOrder(points)
+        self.points = points
+        self.radial = radial
+        self.xs = np.array([p.x for p in points])
+        self.ys = np.array([p.y for p in points])
+        self.alive = [True] * n
+        self.onHull = np.zeros(n, dtype=bool)
+        self.next = [-1] * n
+        self.prev = [-1] * n
+        self.size = [n]
+        self.journal = []
+        hull = monotoneChainHull(points)
+        for j in range(len(hull)):
+            self.next[hull[j]] = hull[(j + 1) % len(hull)]
+            self.prev[hull[j]] = hull[j - 1]
+            self.onHull[hull[j]] = True
+
+    def set(self, array, index, value):
+        '''Sets array[index] to value, recording the old value'''
+
+        self.journal.append((array, index, array[index]))
+        array[index] = value
+
+    def snapshot(self):
+        '''Returns a mark that rollback can restore the hull to'''
+
+        return len(self.journal)
+
+    def rollback(self, mark):
+        '''Undoes every change made since snapshot returned mark'''
+
+        journal = self.journal
+        while len(journal) > mark:
+            array, index, value = journal.pop()
+            array[index] = value
+
+    def hull(self):
+        '''Returns the indices of the current hull counterclockwise'''
+
+        start = int(np.argmax(self.onHull))
+        vertices = [start]
+        while self.next[vertices[-1]] != start:
+            vertices.append(self.next[vertices[-1]])
+        return vertices
+
+    def delete(self, v):
+        '''Deletes hull vertex v
+
+            Returns:
+                The new hull chain counterclockwise from the old clockwise
+                neighbour of v to its old counterclockwise neighbour, both
+                included
+        '''
+
+        a = self.prev[v]
+        b = self.next[v]
+        self.set(self.alive, v, False)
+        self.set(self.onHull, v, False)
+        self.set(self.size, 0, self.size[0] - 1)
+        if a == b:
+            self.set(self.next, a, a)
+            self.set(self.prev, a, a)
+            return [a]
+
+        #Points that can become hull vertices lie in the triangle a, v, b
+        #cut off with v. Seen from a these are the points left strictly
+        #between v and b, already in counterclockwise order.
+        xs = self.radial.xs
+        ys = self.radial.ys
+        chain = [a]
+        for p in self.radial.between(a, v, b, self.alive) + [b]:
+            while (len(chain) >= 2 and orient2d(xs[chain[-2]], ys[chain[-2]], xs[chain[-1]],
+                                                ys[chain[-1]], xs[p], ys[p]) <= 0):
+                chain.pop()
+            chain.append(p)
+
+        for j in range(len(chain) - 1):
+            self.set(self.next, chain[j], chain[j + 1])
+            self.set(self.prev, chain[j + 1], chain[j])
+            self.set(self.onHull, chain[j + 1], True)
+        return chain
+
+def hullJumpingIndices(hull, point, string, mask, memo, count=False):
+    '''Hull jumping from hull vertex point of a DeletionHull
+
+        Deletes point and jumps to each vertex of the newly exposed chain
+        that moves in the direction of the first letter of string, leaving
+        the hull as it found it. The hull is fully determined by the points
+        left, so the result only depends on (mask, point, string) and is
+        cached in memo under that key.
+
+        Arguments:
+            hull: the DeletionHull, with point on its hull
+            point: index of the current point
+            string: the rest of the path string as a PathString
+            mask: bitmask of the indices of the points left, point included
+            memo: dictionary of results shared by every call on this hull
+            count: return the number of paths instead of the paths
+
+        Returns:
+            The index paths found, each a tuple listing the points after
+            point in reverse order, or their number if count is set
+    '''
+
+    key = (mask, point, string)
+    if key in memo:
+        return memo[key]
+
+    ys = hull.ys
+    up = not string.startsDown()
+    if string.length == 1:
+        other = hull.next[point]
+        found = (ys[other] > ys[point]) == up
+        if count:
+            out = int(found)
+        else:
+            out = [(other,)] if found else []
+        memo[key] = out
+        return out
+
+    mark = hull.snapshot()
+    nextPoints = hull.delete(point)
+    rest = mask & ~(1 << point)
+    out = 0 if count else []
+
+    #Try jumping to a point in the next hull
+    for p in nextPoints:
+        if (ys[p] > ys[point]) == up:
+            found = hullJumpingIndices(hull, p, string.suffix(), rest, memo, count)
+            if count:
+                out += found
+            else:
+                out.extend(arr + (p,) for arr in found)
+    hull.rollback(mark)
+    memo[key] = out
+    return out
+
+def hullJumping(points, string, hull=None, count=False):
+    '''A wrapper for the hull jumping algorithm
+
+        Points are indexed by height for the bitmasks of the remaining point
+        sets, and one memo is shared by every start point, so a state
+        reached from several starts is only explored once. With count set
+        the number of paths is returned instead of the paths.
+    '''
 
     if hull == None:
         hull = convexHull(points)
-    found = False
-    output = []
+    string = PathString(string)
+    points = sorted(points, key=lambda p: p.y)
+    deletionHull = DeletionHull(points)
+    indices = {id(p): i for i, p in enumerate(points)}
+    mask = (1 << len(points)) - 1
+    memo = {}
+    output = 0 if count else []
 
     #Start the recursive hull jumping algorithm from each point in the hull
     for point in hull:
-        out, success = hullJumpingRecursive(copy.copy(points),point,string)
-        if success:
-            found = True
-            for o in out:
-                o.append(point)
-                output.append(o)
+        found = hullJumpingIndices(deletionHull, indices[id(point)], string, mask, memo, count)
+        if count:
+            output += found
+        else:
+            for arr in found:
+                output.append([points[i] for i in arr] + [point])
 
     return output
 
 def hullJumpingRecursive(points, point, string):
-    '''A recursive implementation for the hull jumping algorithm'''
-
-    if (len(string) == 1):
-        points.remove(point)
-        if string[0] == "U" and points[0].y < point.y:
-            return [[points[0]]], True
-        if string[0] == "D" and points[0].y > point.y:
-            return [[points[0]]], True
-        return [[]], False
-
-    #Find previous point and next point on the convex hull
-    p1, p2 = jarvisMarchSinglePass(points, point)
-
-    #Determine what new points will be on the convex hull after removing the current point
-    p3, p4 = jarvisMarchSinglePass(points, p1)
-    if p3.x == point.x and p3.y == point.y:
-        p3 = p4
-    p4 = p1
-    points.remove(point)
-    nextPoints = [p1]
-    while p4.x != p2.x and p4.y != p2.y:
-        p5, p6 = jarvisMarchSinglePass(points, p4)
-        if p5.x == p3.x and p5.y == p3.y:
-            p5 = p6
-        p3 = p4
-        p4 = p5
-        nextPoints.append(p4)
-
-    out = []
-    success = False
+    '''A recursive implementation for the hull jumping algorithm
 
-    #Try jumping to a point in the next hull
-    if (string[0] == "U"):
-        for p in nextPoints:
-            if p.y > point.y:
-                tempPoints = copy.copy(points)
-                tempString = string[1:]
-                output, successful = hullJumpingRecursive(tempPoints, p, tempString)
-                if successful:
-                    for arr in output:
-                        arr.append(p)
-                        out.append(arr)
-                    success = True
-    else:
-        for p in nextPoints:
-            if p.y < point.y:
-                tempPoints = copy.copy(points)
-                tempString = string[1:]
-                output, successful = hullJumpingRecursive(tempPoints, p, tempString)
-                if successful:
-                    for arr in output:
-                        arr.append(p)
-                        out.append(arr)
-                    success = True
-    return out, success
-
-print(hullJumping(generatePoints(1000,1000,5), "UDUU"))
-print(pathStringDPWrapper(generatePoints(1000,1000,5), "UDUU"))
+        Runs hullJumpingIndices on a DeletionHull of points, which must
+        have point on its hull, and returns the paths as points
+    '''
+
+    start = [id(p) for p in points].index(id(point))
+    found = hullJumpingIndices(DeletionHull(points), start, PathString(string),
+                               (1 << len(points)) - 1, {})
+    out = [[points[i] for i in arr] for arr in found]
+    return out, len(out) > 0
+
+if __name__ == "__main__":
+    print(hullJumping(generatePoints(1000,1000,5), "UDUU"))
+    print(pathStringDPWrapper(generatePoints(1000,1000,5), "UDUU"))
@@ -1,33 +1,96 @@
+from PathString import *
+import numpy as np
+
 def partialOrderings(string, solved):
     '''Returns number of ordered lists satisfying a path string.
         NOTE:This is an upperbound on number of pathstring solutions
+        NOTE:solved is keyed by PathString, string may be text or a PathString
     '''
-    count = 0
-    solved[string] = []
-    if len(string) == 1:
+    if not isinstance(string, PathString):
+        string = PathString(string)
+    if string.length == 1:
         solved[string] = 1
-        return
-    if string[0] == "D":
-        partial = string[1:]
-        if (partial not in solved):
-            partialOrderings(partial, solved)
-        count += solved[partial]
-    if string[len(string) - 1] == "U":
-        partial = string[:len(string) - 1]
-        if (partial not in solved):
+        return 1
+
+    #The lowest point starts the list after a D, ends it before a U or sits
+    #in a valley UD, the same subproblems as pathStringPartials
+    count = 0
+    for partial in string.partials():
+        if partial not in solved:
             partialOrderings(partial, solved)
         count += solved[partial]
-    for i in range(0, len(string) - 1):
-        if string[i] == "U":
-            if string[i + 1] == "D":
-                partial1 = string[:i] + "U" + string[i + 2:]
-                partial2 = string[:i] + "D" + string[i + 2:]
-                if partial1 not in solved:
-                    partialOrderings(partial1, solved)
-                count += solved[partial1]
-                if partial2 not in solved:
-                    partialOrderings(partial2, solved)
-                count += solved[partial2]
-                i += 1
     solved[string] = count
     return count
+
+#Counts are held in base 2^32 limbs of a uint64 array so sums of up to 2^31
+#limbs can't overflow before the carries are propagated
+LIMB_BITS = 32
+LIMB_MASK = (1 << LIMB_BITS) - 1
+
+def partialOrderingsTable(n):
+    '''Returns partialOrderings for every path string on n points
+
+        Works bottom up over the string lengths using the same recurrence as
+        partialOrderings. Each length is one array indexed by the string
+        bits, and every term of the recurrence is a strided slice of the
+        previous length's array, so a level costs a few whole array
+        additions. Counts are kept exactly in 32 bit limbs.
+
+        Arguments:
+            n: the number of points, so the strings have length n - 1
+
+        Returns:
+            An array of the 2^(n-1) counts indexed by PathString bits. It
+            is int64 when every count fits, otherwise an object array of
+            Python ints.
+    '''
+
+    level = np.ones((1, 1), dtype=np.uint64)
+    for length in range(1, n):
+        total = np.zeros((level.shape[0], 2 ** length), dtype=np.uint64)
+
+        #A D first, the lowest point is the start
+        total[:, 2 ** (length - 1):] += level
+
+        #A U last, the lowest point is the end
+        total[:, 0::2] += level
+
+        #A valley UD at bits p and p - 1, the lowest point is in the middle
+        #and the pair is replaced by either letter
+        for p in range(1, length):
+            low = 2 ** (p - 1)
+            valleys = total.reshape(-1, 2 ** (length - 1 - p), 4, low)[:, :, 1, :]
+            partials = level.reshape(-1, 2 ** (length - 1 - p), 2, low)
+            valleys += partials[:, :, 0, :]
+            valleys += partials[:, :, 1, :]
+
+        #Propagate the carries, adding a limb when the top one overflows
+        limb = 0
+        while limb < total.shape[0]:
+            carry = total[limb] >> np.uint64(LIMB_BITS)
+            if carry.any():
+                total[limb] &= np.uint64(LIMB_MASK)
+                if limb + 1 == total.shape[0]:
+                    total = np.vstack((total, np.zeros((1, total.shape[1]), dtype=np.uint64)))
+                total[limb + 1] += carry
+            limb += 1
+        level = total
+
+    #Counts below 2^63 are read off the two lowest limbs directly and only
+    #the overflowing ones are assembled as Python ints
+    counts = level[0].astype(np.int64)
+    fits = np.ones(level.shape[1], dtype=bool)
+    if level.shape[0] > 1:
+        fits = ~(level[1] >> np.uint64(LIMB_BITS - 1)).astype(bool)
+        for limb in level[2:]:
+            fits &= limb == 0
+        counts |= (level[1] & np.uint64(LIMB_MASK >> 1)).astype(np.int64) << np.int64(LIMB_BITS)
+    if fits.all():
+        return counts
+    counts = counts.astype(object)
+    for bits in np.nonzero(~fits)[0].tolist():
+        count = 0
+        for limb in reversed(range(level.shape[0])):
+            count = (count << LIMB_BITS) | int(level[limb, bits])
+        counts[bits] = count
+    return counts
@@ -0,0 +1,114 @@
+import hashlib
+import mmap
+import os
+import struct
+
+from PathString import *
+
+#Record header: length of the path string and number of paths that follow
+RECORD_HEADER = struct.Struct("<HI")
+
+def pointSetHash(points):
+    '''Returns a hex digest identifying a point set by its sorted coordinates'''
+
+    digest = hashlib.sha256()
+    for p in sorted(points, key=lambda p: (p.y, p.x)):
+        digest.update(struct.pack("<dd", p.x, p.y))
+    return digest.hexdigest()
+
+class DiskPathCache:
+    '''Disk backed dictionary from PathStrings to lists of index paths
+
+        Each point set gets its own file in directory, named by the hash of
+        its sorted coordinates, so re-running the same point set picks up
+        every subproblem solved so far. The file is a sequence of records,
+        each a header with the string length and path count, the string,
+        then the paths packed back to back as len(string) + 1 bytes each.
+        Records are only appended, and a record cut short by an interrupted
+        run is dropped when the file is next opened.
+
+        Only the record headers are read when opening. Paths are sliced out
+        of a memory map of the file when a string is looked up, so the cache
+        is never deserialized wholesale. It can be passed anywhere a solved
+        dictionary of index paths is expected. Strings are stored as text
+        and keyed by PathString once read.
+    '''
+
+    def __init__(self, directory, points):
+        '''Open or create the cache file for a point set in directory'''
+
+        os.makedirs(directory, exist_ok=True)
+        self.filename = os.path.join(directory, pointSetHash(points) + ".paths")
+        self.index = {}
+        self.file = open(self.filename, "a+b")
+        self.map = None
+        self.mapSize = 0
+        self.scan()
+
+    def scan(self):
+        '''Index the records in the file, truncating a partial last record'''
+
+        size = os.path.getsize(self.filename)
+        self.remap(size)
+        offset = 0
+        while offset + RECORD_HEADER.size <= size:
+            length, count = RECORD_HEADER.unpack_from(self.map, offset)
+            start = offset + RECORD_HEADER.size + length
+            end = start + count * (length + 1)
+            if end > size:
+                break
+            string = PathString(self.map[offset + RECORD_HEADER.size:start].decode("ascii"))
+            self.index[string] = (start, count)
+            offset = end
+        if offset < size:
+            self.file.truncate(offset)
+            self.remap(offset)
+
+    def remap(self, size):
+        '''Memory map the first size bytes of the file'''
+
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.mapSize = size
+        if size > 0:
+            self.map = mmap.mmap(self.file.fileno(), size, access=mmap.ACCESS_READ)
+
+    def __contains__(self, string):
+        return PathString(string) in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, string):
+        '''Returns the index paths stored for a path string'''
+
+        string = PathString(string)
+        start, count = self.index[string]
+        width = string.length + 1
+        if start + count * width > self.mapSize:
+            self.file.flush()
+            self.remap(os.path.getsize(self.filename))
+        return [self.map[i:i + width] for i in range(start, start + count * width, width)]
+
+    def __setitem__(self, string, paths):
+        '''Appends the index paths of a path string to the file'''
+
+        string = PathString(string)
+        if string in self.index:
+            return
+        self.file.seek(0, os.SEEK_END)
+        offset = self.file.tell()
+        encoded = str(string).encode("ascii")
+        self.file.write(RECORD_HEADER.pack(len(encoded), len(paths)) + encoded)
+        self.file.write(b"".join(paths))
+        self.file.flush()
+        self.index[string] = (offset + RECORD_HEADER.size + len(encoded), len(paths))
+
+    def close(self):
+        '''Close the memory map and the file'''
+
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
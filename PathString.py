@@ -0,0 +1,212 @@
+def pathStringToBits(string):
+    '''Encodes a path string as an integer, reading it as binary with U as 0
+    and D as 1, so a string's bits are its index in levelStrings'''
+
+    bits = 0
+    for letter in string:
+        bits = (bits << 1) | (letter == "D")
+    return bits
+
+def bitsToPathString(bits, length):
+    '''Decodes the path string of the given length from its bits'''
+
+    return "{0:0{1}b}".format(bits, length).replace("0", "U").replace("1", "D") if length else ""
+
+class PathString(int):
+    '''A path string packed into its bits and length
+
+        Letter i is bit length-1-i of bits, 0 for U and 1 for D, so the
+        strings of one length in increasing order of bits are in the binary
+        order of levelStrings. The pair is held as the single int
+        2^length + bits, the leading 1 marking the length, so a PathString
+        hashes and compares as quickly as a small int when used as a
+        dictionary key. Taking a prefix, a suffix or contracting a UD pair
+        is a few integer operations instead of slicing and joining text.
+        Text is only produced by str.
+
+        PathString("UDUD") packs text, PathString(5, 4) takes bits and a
+        length, and a PathString passes through unchanged. Text with letters
+        other than U and D, or bits that don't fit in length letters, raise
+        a ValueError.
+    '''
+
+    __slots__ = ()
+
+    def __new__(cls, string, length=None):
+        if length is None:
+            if isinstance(string, PathString):
+                return string
+            if string.strip("UD"):
+                raise ValueError("path strings only have the letters U and D: " + repr(string))
+            length = len(string)
+            string = pathStringToBits(string)
+        elif length < 0 or not 0 <= string < 1 << length:
+            raise ValueError("bits {0} don't fit a path string of length {1}".format(string, length))
+        return int.__new__(cls, (1 << length) | string)
+
+    def __getnewargs__(self):
+        return (self.bits, self.length)
+
+    @property
+    def bits(self):
+        return int(self) ^ (1 << (self.bit_length() - 1))
+
+    @property
+    def length(self):
+        return self.bit_length() - 1
+
+    def __str__(self):
+        return "{0:b}".format(self)[1:].replace("0", "U").replace("1", "D")
+
+    def __repr__(self):
+        return "PathString(" + repr(str(self)) + ")"
+
+    def isDown(self, i):
+        '''Returns whether letter i is a D'''
+
+        return self >> (self.bit_length() - 2 - i) & 1 == 1
+
+    def letter(self, i):
+        '''Returns letter i as "U" or "D"'''
+
+        return "D" if self.isDown(i) else "U"
+
+    def startsDown(self):
+        '''Returns whether the first letter is a D, False for the empty
+        string'''
+
+        return self > 1 and self >> (self.bit_length() - 2) == 3
+
+    def endsUp(self):
+        '''Returns whether the last letter is a U, False for the empty
+        string'''
+
+        return self > 1 and self & 1 == 0
+
+    def suffix(self):
+        '''Returns the string without its first letter, the empty string
+        for the empty string'''
+
+        if self == 1:
+            return self
+        first = 1 << (self.bit_length() - 2)
+        return _pack(PathString, first | (self & (first - 1)))
+
+    def prefix(self):
+        '''Returns the string without its last letter, the empty string
+        for the empty string'''
+
+        return _pack(PathString, self >> 1) if self > 1 else self
+
+    def valleys(self):
+        '''Returns the positions i in increasing order where letters i and
+        i+1 are a UD'''
+
+        length = self.bit_length() - 1
+        starts = ~self & (self << 1) & ((1 << length) - 1) & -2
+        out = []
+        while starts:
+            p = starts.bit_length() - 1
+            out.append(length - 1 - p)
+            starts ^= 1 << p
+        return out
+
+    def contract(self, i, down):
+        '''Returns the string with letters i and i+1 replaced by one letter,
+        a D if down is set and a U otherwise'''
+
+        p = self.bit_length() - 2 - i
+        low = self & ((1 << (p - 1)) - 1)
+        return _pack(PathString, (self >> (p + 1) << p) | (down << (p - 1)) | low)
+
+    def valleyPartials(self):
+        '''Returns (i, contract(i, False), contract(i, True)) for every
+        valley i in increasing order'''
+
+        length = self.bit_length() - 1
+        starts = ~self & (self << 1) & ((1 << length) - 1) & -2
+        out = []
+        while starts:
+            p = starts.bit_length() - 1
+            starts ^= 1 << p
+            high = self >> (p + 1) << p
+            low = self & ((1 << (p - 1)) - 1)
+            out.append((length - 1 - p, _pack(PathString, high | low),
+                        _pack(PathString, high | (1 << (p - 1)) | low)))
+        return out
+
+    def partials(self):
+        '''Returns the strings one letter shorter that this one is built
+        from, see pathStringPartials'''
+
+        length = self.bit_length() - 1
+        out = []
+        if length <= 1:
+            return out
+        first = 1 << (length - 1)
+        if self & first:
+            out.append(_pack(PathString, first | (self & (first - 1))))
+        if not self & 1:
+            out.append(_pack(PathString, self >> 1))
+        starts = ~self & (self << 1) & ((first - 1) << 1)
+        while starts:
+            p = starts.bit_length() - 1
+            starts ^= 1 << p
+            high = self >> (p + 1) << p
+            low = self & ((1 << (p - 1)) - 1)
+            out.append(_pack(PathString, high | low))
+            out.append(_pack(PathString, high | (1 << (p - 1)) | low))
+        return out
+
+    def reverseComplement(self):
+        '''Returns the string read backwards with U and D swapped, the
+        string of the same paths walked in the opposite direction'''
+
+        length = self.bit_length() - 1
+        text = "{0:b}".format(self ^ ((1 << length) - 1))
+        return _pack(PathString, int("1" + text[:0:-1], 2)) if length else self
+
+    @classmethod
+    def level(cls, length):
+        '''Returns every path string of a length in binary order'''
+
+        return [_pack(cls, bits) for bits in range(1 << length, 2 << length)]
+
+class PathStringDict(dict):
+    '''Dictionary keyed by PathStrings that also looks up text keys
+
+        The solvers key their results by PathString, which hashes as an int
+        and so never equals its text. Looking up, testing or getting a text
+        key converts it first, so result["UDUU"] and "UDUU" in result work
+        as they did when results were keyed by text. Keys are still stored
+        as given, so strings should be added as PathStrings.
+    '''
+
+    __slots__ = ()
+
+    def __missing__(self, key):
+        string = _textKey(key) if isinstance(key, str) else key
+        if string is not key and dict.__contains__(self, string):
+            return dict.__getitem__(self, string)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            key = _textKey(key)
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        if isinstance(key, str):
+            key = _textKey(key)
+        return dict.get(self, key, default)
+
+def _textKey(text):
+    '''Returns the PathString of text, or text itself if it isn't one'''
+
+    try:
+        return PathString(text)
+    except ValueError:
+        return text
+
+#Builds a PathString from its packed int without going through __new__
+_pack = int.__new__
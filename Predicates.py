@@ -0,0 +1,62 @@
+from fractions import Fraction
+import numpy as np
+
+#Relative error bound of the floating point orientation determinant, the
+#(3 + 16e)e of Shewchuk's ccwerrboundA for machine epsilon e = 2^-53
+ORIENT_ERROR_BOUND = (3.0 + 16.0 * 2.0 ** -53) * 2.0 ** -53
+
+def orient2dExact(ax, ay, bx, by, cx, cy):
+    '''Returns the sign of the signed area of a, b, c in exact arithmetic'''
+
+    ax, ay = Fraction(ax), Fraction(ay)
+    det = (Fraction(bx) - ax) * (Fraction(cy) - ay) - (Fraction(by) - ay) * (Fraction(cx) - ax)
+    if det > 0:
+        return 1
+    if det < 0:
+        return -1
+    return 0
+
+def orient2d(ax, ay, bx, by, cx, cy):
+    '''Returns 1 if c is left of the line from a to b, -1 if it is right of
+    it and 0 if the three points are colinear
+
+        The signed area is computed in floating point. Its sign is exact
+        when the two products can't cancel, that is when one is zero or
+        they differ in sign, which covers points shared between segments.
+        Otherwise it is used when the area is further from zero than the
+        rounding error can be. Only the rare near degenerate cases fall
+        back to exact arithmetic.
+    '''
+
+    detleft = (bx - ax) * (cy - ay)
+    detright = (by - ay) * (cx - ax)
+    det = detleft - detright
+    if (detleft > 0 and detright <= 0) or (detleft < 0 and detright >= 0) or detleft == 0:
+        return (det > 0) - (det < 0)
+    bound = ORIENT_ERROR_BOUND * (abs(detleft) + abs(detright))
+    if det > bound:
+        return 1
+    if -det > bound:
+        return -1
+    return orient2dExact(ax, ay, bx, by, cx, cy)
+
+def orient2dArrays(ax, ay, bx, by, cx, cy):
+    '''Vectorized orient2d over NumPy arrays that broadcast together
+
+        Returns an int array of signs. The float filter is applied to every
+        element at once and only the elements it cannot decide are redone
+        exactly.
+    '''
+
+    detleft = (bx - ax) * (cy - ay)
+    detright = (by - ay) * (cx - ax)
+    det = detleft - detright
+    orient = np.array(np.sign(det), dtype=np.int8)
+    uncertain = np.abs(det) <= ORIENT_ERROR_BOUND * (np.abs(detleft) + np.abs(detright))
+    if uncertain.any():
+        uncertain &= ((detleft > 0) & (detright > 0)) | ((detleft < 0) & (detright < 0))
+        ax, ay, bx, by, cx, cy = np.broadcast_arrays(ax, ay, bx, by, cx, cy)
+        for index in zip(*np.nonzero(uncertain)):
+            orient[index] = orient2dExact(ax[index], ay[index], bx[index], by[index],
+                                          cx[index], cy[index])
+    return orient
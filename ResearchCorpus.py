@@ -0,0 +1,285 @@
+import collections
+import glob
+import json
+import os
+
+import numpy as np
+
+from PartialOrderings import *
+from SweepResults import *
+
+RESEARCH_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ResearchData")
+
+#Bumped whenever the parsed layout changes so stale caches are re-parsed
+CORPUS_VERSION = 1
+
+#partialOrderingsTable by number of points, shared by every CountTable
+_bounds = {}
+
+def partialOrderingsBounds(n):
+    '''Returns partialOrderingsTable(n), computed once per n'''
+
+    if n not in _bounds:
+        _bounds[n] = partialOrderingsTable(n)
+    return _bounds[n]
+
+class CountTable:
+    '''The counts recorded for path strings of one length in one file
+
+        Every recorded count is one observation, held column wise in three
+        arrays: the PathString bits of its string, the count and the trial
+        it belongs to. Queries reduce the observations to arrays indexed by
+        string bits, with -1 (or nan for ratios) for strings no trial
+        recorded, so files with a complete sweep per trial and files with a
+        scattered sample of strings are handled the same way.
+    '''
+
+    def __init__(self, length, bits, counts, trials):
+        self.length = length
+        self.bits = np.asarray(bits, dtype=np.int64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.trials = np.asarray(trials, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __repr__(self):
+        return ("CountTable(length=" + str(self.length) + ", observations=" +
+                str(len(self)) + ", trials=" + str(self.trialCount()) + ")")
+
+    def trialCount(self):
+        '''Returns the number of trials'''
+
+        return int(self.trials.max()) + 1 if len(self.trials) else 0
+
+    def observations(self):
+        '''Returns how many times each string was recorded'''
+
+        return np.bincount(self.bits, minlength=2 ** self.length)
+
+    def maxCounts(self):
+        '''Returns the largest count of each string across trials'''
+
+        out = np.full(2 ** self.length, -1, dtype=np.int64)
+        np.maximum.at(out, self.bits, self.counts)
+        return out
+
+    def minCounts(self):
+        '''Returns the smallest count of each string across trials'''
+
+        out = np.full(2 ** self.length, np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(out, self.bits, self.counts)
+        out[self.observations() == 0] = -1
+        return out
+
+    def meanCounts(self):
+        '''Returns the mean count of each string across trials'''
+
+        seen = self.observations()
+        totals = np.bincount(self.bits, self.counts, minlength=2 ** self.length)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(seen > 0, totals / seen, np.nan)
+
+    def trialCounts(self, trial):
+        '''Returns the counts of one trial'''
+
+        out = np.full(2 ** self.length, -1, dtype=np.int64)
+        rows = self.trials == trial
+        out[self.bits[rows]] = self.counts[rows]
+        return out
+
+    def bounds(self):
+        '''Returns the partialOrderings upper bound of each string'''
+
+        return partialOrderingsBounds(self.length + 1)
+
+    def ratios(self, counts=None):
+        '''Returns counts, the maximum counts by default, over the
+        partialOrderings bounds, nan where a string wasn't recorded'''
+
+        if counts is None:
+            counts = self.maxCounts()
+        counts = np.asarray(counts)
+        return np.where(counts >= 0, counts / self.bounds().astype(float), np.nan)
+
+    def outOfBounds(self):
+        '''Returns the recorded strings with a count below 1 or above their
+        partialOrderings bound, in order of bits'''
+
+        bounds = self.bounds()
+        bad = (self.counts < 1) | (self.counts > bounds[self.bits])
+        return [PathString(bits, self.length) for bits in np.unique(self.bits[bad]).tolist()]
+
+class CountFile:
+    '''The CountTables of one file, by string length'''
+
+    def __init__(self, filename, tables, warnings=()):
+        self.filename = filename
+        self.tables = tables
+        self.warnings = list(warnings)
+
+    def __getitem__(self, length):
+        return self.tables[length]
+
+    def __contains__(self, length):
+        return length in self.tables
+
+    def __iter__(self):
+        return iter(sorted(self.tables))
+
+    def __repr__(self):
+        return ("CountFile(" + repr(os.path.basename(self.filename)) + ", " +
+                repr([self.tables[length] for length in self]) + ")")
+
+def parseCountFile(filename):
+    '''Parses a ResearchData file into a CountFile
+
+        Understands every layout the sweeps have written:
+            "string, count" lines, one per string, several sweeps or
+                lengths one after another or strings in no order at all
+            "string, max, bound" lines from bunchOfTrials, read as the max
+            wide rows "string,count,,string,count,,..." with one trial per
+                row as in bunchOfFives.csv
+        Lines without a path string, like the summary rows at the end of
+        bunchOfFives.csv, are skipped.
+
+        A line starts a new trial for its string length when its string was
+        already recorded in the current trial, which splits concatenated
+        sweeps. In a wide row a string listed twice is only recorded once
+        and the repeat is reported in the warnings.
+    '''
+
+    columns = collections.defaultdict(lambda: ([], [], []))
+    trial = collections.defaultdict(int)
+    seen = collections.defaultdict(set)
+    repeats = collections.Counter()
+
+    def isPathString(field):
+        return field != "" and field.strip("UD") == ""
+
+    with open(filename) as f:
+        for line in f:
+            fields = [field.strip() for field in line.split(",")]
+            if len(fields) > 3:
+
+                #A wide row is a trial of its own
+                pairs = [(fields[i], fields[i + 1]) for i in range(0, len(fields) - 1, 3)]
+                pairs = [(label, count) for label, count in pairs
+                         if isPathString(label) and count.isdigit()]
+                for length in set(len(label) for label, count in pairs):
+                    if seen[length]:
+                        trial[length] += 1
+                        seen[length] = set()
+                for label, count in pairs:
+                    bits = pathStringToBits(label)
+                    if bits in seen[len(label)]:
+                        repeats[label] += 1
+                        continue
+                    seen[len(label)].add(bits)
+                    column = columns[len(label)]
+                    column[0].append(bits)
+                    column[1].append(int(count))
+                    column[2].append(trial[len(label)])
+            elif len(fields) >= 2 and isPathString(fields[0]) and fields[1].isdigit():
+                label = fields[0]
+                length = len(label)
+                bits = pathStringToBits(label)
+                if bits in seen[length]:
+                    trial[length] += 1
+                    seen[length] = set()
+                seen[length].add(bits)
+                column = columns[length]
+                column[0].append(bits)
+                column[1].append(int(fields[1]))
+                column[2].append(trial[length])
+
+    warnings = [label + " is listed twice in " + str(rows) + " wide rows"
+                for label, rows in sorted(repeats.items())]
+    tables = {length: CountTable(length, *column) for length, column in columns.items()}
+    return CountFile(filename, tables, warnings)
+
+def cacheFilename(filename):
+    '''Returns the file the parsed form of a source file is cached in'''
+
+    return os.path.splitext(filename)[0] + ".parsed.npz"
+
+def sourceStamp(filename):
+    '''Returns what a cache records to tell whether its source changed'''
+
+    status = os.stat(filename)
+    return {"version": CORPUS_VERSION, "size": status.st_size, "mtime": status.st_mtime_ns}
+
+def writeCountCache(countFile):
+    '''Writes the parsed form of a CountFile next to its source
+
+        Caching is skipped quietly when the directory isn't writable.
+    '''
+
+    arrays = {}
+    for length in countFile:
+        table = countFile[length]
+        arrays["bits" + str(length)] = table.bits
+        arrays["counts" + str(length)] = table.counts
+        arrays["trials" + str(length)] = table.trials
+    header = dict(sourceStamp(countFile.filename), lengths=list(countFile),
+                  warnings=countFile.warnings)
+    arrays["metadata"] = np.array(json.dumps(header))
+    try:
+        np.savez(cacheFilename(countFile.filename), **arrays)
+    except OSError:
+        pass
+
+def readCountCache(filename):
+    '''Returns the cached CountFile of a source file, or None if there is
+    no cache or it is stale'''
+
+    try:
+        with np.load(cacheFilename(filename)) as data:
+            header = json.loads(str(data["metadata"]))
+            stamp = sourceStamp(filename)
+            if any(header.get(key) != value for key, value in stamp.items()):
+                return None
+            tables = {length: CountTable(length, data["bits" + str(length)],
+                                         data["counts" + str(length)],
+                                         data["trials" + str(length)])
+                      for length in header["lengths"]}
+    except (OSError, KeyError, ValueError):
+        return None
+    return CountFile(filename, tables, header["warnings"])
+
+def loadCountFile(filename, cache=True):
+    '''Loads a ResearchData CSV file or a ResultsWriter npz file
+
+        CSV files are parsed by parseCountFile once and then read back from
+        the parsed cache next to them until they change. Set cache to False
+        to always parse and not write a cache.
+    '''
+
+    if filename.endswith(".npz"):
+        metadata, counts, pointHashes = loadResults(filename)
+        length = metadata["n"] - 1
+        trials, bits = np.indices(counts.shape)
+        table = CountTable(length, bits.ravel(), counts.ravel(), trials.ravel())
+        return CountFile(filename, {length: table})
+
+    if cache:
+        countFile = readCountCache(filename)
+        if countFile is not None:
+            return countFile
+    countFile = parseCountFile(filename)
+    if cache:
+        writeCountCache(countFile)
+    return countFile
+
+def loadResearchData(directory=RESEARCH_DATA, cache=True):
+    '''Loads every CSV and results file in a directory
+
+        Returns:
+            A dictionary from file name, without the directory, to CountFile
+    '''
+
+    filenames = glob.glob(os.path.join(directory, "*.csv")) + [
+        filename for filename in glob.glob(os.path.join(directory, "*.npz"))
+        if not filename.endswith(".parsed.npz")]
+    return {os.path.basename(filename): loadCountFile(filename, cache)
+            for filename in sorted(filenames)}
@@ -0,0 +1,129 @@
+import json
+import time
+import zipfile
+
+import numpy as np
+
+from PartialOrderings import *
+from PathCache import *
+
+#Counts are written to the archive this many at a time
+RESULTS_CHUNK = 2**20
+
+class ResultsWriter:
+    '''Writes the per string counts of sweeps as a columnar npz file
+
+        The file is an ordinary npz archive that numpy.load can open. It
+        holds
+            counts: int64 array of shape (trials, 2^(n-1)), row t holding the
+                counts of trial t indexed by PathString bits
+            pointHashes: the pointSetHash of each trial's point set
+            metadata: a JSON header with n, the seed, the number of trials,
+                the creation time and any extra fields given
+
+        Rows are streamed into the archive in chunks of RESULTS_CHUNK counts
+        as they are added, so only the trial being written is held in
+        memory. The number of trials has to be known up front as it is part
+        of the array header. Compression is on its fastest level, the
+        counts being small integers with many repeats.
+    '''
+
+    def __init__(self, filename, n, trials=1, seed=None, compress=True, **metadata):
+        '''Open filename for the results of trials sweeps on n points'''
+
+        self.n = n
+        self.trials = trials
+        self.width = 2 ** (n - 1)
+        self.pointHashes = []
+        self.metadata = dict(metadata, n=n, seed=seed, trials=trials,
+                             created=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        self.archive = zipfile.ZipFile(filename, "w", compression, allowZip64=True,
+                                       compresslevel=1)
+        self.counts = self.archive.open("counts.npy", "w", force_zip64=True)
+        np.lib.format.write_array_header_2_0(self.counts, {
+            "descr": np.lib.format.dtype_to_descr(np.dtype("<i8")),
+            "fortran_order": False,
+            "shape": (trials, self.width),
+        })
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        if excType is None:
+            self.close()
+        elif self.archive is not None:
+
+            #Leave the file incomplete rather than hide the error with one
+            #about missing trials
+            archive = self.archive
+            self.archive = None
+            try:
+                self.counts.close()
+            finally:
+                archive.close()
+
+    def addTrial(self, counts, points=None):
+        '''Appends the counts of one trial, in PathString bits order, and
+        records the hash of its point set'''
+
+        if len(self.pointHashes) == self.trials:
+            raise ValueError("all " + str(self.trials) + " trials are already written")
+        counts = np.asarray(counts, dtype="<i8")
+        if counts.shape != (self.width,):
+            raise ValueError("expected " + str(self.width) + " counts, got " + str(counts.shape))
+        for start in range(0, self.width, RESULTS_CHUNK):
+            self.counts.write(counts[start:start + RESULTS_CHUNK].tobytes())
+        self.pointHashes.append(pointSetHash(points) if points is not None else "")
+
+    def close(self):
+        '''Finish the counts and write the point hashes and metadata'''
+
+        if self.archive is None:
+            return
+        self.counts.close()
+        archive = self.archive
+        self.archive = None
+        if len(self.pointHashes) != self.trials:
+            archive.close()
+            raise ValueError("only " + str(len(self.pointHashes)) + " of " +
+                             str(self.trials) + " trials were written")
+        for name, array in (("pointHashes", np.array(self.pointHashes, dtype="U64")),
+                            ("metadata", np.array(json.dumps(self.metadata)))):
+            with archive.open(name + ".npy", "w") as f:
+                np.lib.format.write_array(f, array, allow_pickle=False)
+        archive.close()
+
+def loadResults(filename):
+    '''Reads a file written by ResultsWriter
+
+        Returns:
+            (metadata, counts, pointHashes) with metadata the decoded JSON
+            header
+    '''
+
+    with np.load(filename) as data:
+        metadata = json.loads(str(data["metadata"]))
+        return metadata, data["counts"], data["pointHashes"].tolist()
+
+def exportResultsCSV(filename, csvFilename):
+    '''Appends the results in an npz file to a CSV file in the text layout
+
+        The layout follows the kind recorded by the writer:
+        generateAllPathStrings files become "string, count" lines and
+        bunchOfTrials files "string, max, bound" lines, whatever the number
+        of trials. Files without a kind get the first layout for a single
+        trial and the second for several.
+    '''
+
+    metadata, counts, pointHashes = loadResults(filename)
+    n = metadata["n"]
+    kind = metadata.get("kind")
+    if kind == "bunchOfTrials" or (kind is None and counts.shape[0] > 1):
+        columns = [counts.max(axis=0), partialOrderingsTable(n)]
+    else:
+        columns = [counts[0]]
+    with open(csvFilename, "a") as f:
+        for bits, string in enumerate(PathString.level(n - 1)):
+            f.write(str(string) + ", " + ", ".join(str(column[bits]) for column in columns) + "\n")
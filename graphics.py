@@ -229,6 +229,8 @@ class GraphWin(tk.Canvas):
         self._mouseCallback = None
         self.trans = None
         self.closed = False
+        self._batchDepth = 0
+        self._batchAutoflush = autoflush
         master.lift()
         self.lastKey = ""
         if autoflush: _root.update()
@@ -305,6 +307,27 @@ class GraphWin(tk.Canvas):
         self.__checkOpen()
         self.update_idletasks()
 
+    def batch(self):
+        """Context manager that holds back updates of the window while
+        drawing and updates it once at the end of the block, however many
+        objects were drawn in it:
+
+            with win.batch():
+                for p in points:
+                    Circle(p, 3).draw(win)
+
+        Batches may be nested, only the outermost one updates."""
+        return _Batch(self)
+
+    def drawAll(self, objects):
+        """Draw every GraphicsObject in objects with a single update of
+        the window. Returns the objects as a list."""
+        objects = list(objects)
+        with self.batch():
+            for obj in objects:
+                obj.draw(self)
+        return objects
+
     def getMouse(self):
         """Wait for mouse click and return Point object representing
         the click"""
@@ -399,6 +422,31 @@ class GraphWin(tk.Canvas):
         self.update()
 
 
+class _Batch:
+
+    """Internal context manager returned by GraphWin.batch"""
+
+    def __init__(self, win):
+        self.win = win
+
+    def __enter__(self):
+        win = self.win
+        if win._batchDepth == 0:
+            win._batchAutoflush = win.autoflush
+            win.autoflush = False
+        win._batchDepth += 1
+        return win
+
+    def __exit__(self, *exc):
+        win = self.win
+        win._batchDepth -= 1
+        if win._batchDepth == 0:
+            win.autoflush = win._batchAutoflush
+            if not win.isClosed():
+                _root.update()
+        return False
+
+
 class Transform:
 
     """Internal class for 2-D coordinate transformations"""
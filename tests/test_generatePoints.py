@@ -0,0 +1,27 @@
+import itertools
+import random
+
+from CleanSolution import *
+
+def inGeneralPosition(points):
+    '''Whether points have distinct heights and no three have a signed area
+    within LineSegment.epsilon'''
+
+    if len({p.y for p in points}) < len(points):
+        return False
+    return all(abs(LineSegment(a, b).signedArea(c)) > LineSegment.epsilon
+               for a, b, c in itertools.combinations(points, 3))
+
+def test_generatePoints():
+    random.seed(12)
+    for n in range(2, 12):
+        #A small square makes near colinear candidates common
+        points = generatePoints(3, 3, n)
+        assert len(points) == n
+        assert inGeneralPosition(points)
+
+def test_generatePointSets():
+    for n in range(2, 12):
+        pointSets = generatePointSets(3, 3, n, 10, seed=n)
+        assert len(pointSets) == 10
+        assert all(len(points) == n and inGeneralPosition(points) for points in pointSets)
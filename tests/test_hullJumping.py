@@ -0,0 +1,64 @@
+import random
+
+from CleanSolution import *
+
+def bruteHullJumping(points, string):
+    '''Every hull jumping path by recomputing the hull of the points left
+    at each step, as a set of tuples of indices into points'''
+
+    paths = set()
+
+    def jump(left, current, string, path):
+        if not string:
+            paths.add(tuple(path))
+            return
+        hull = [left[i] for i in monotoneChainHull([points[i] for i in left])]
+        k = hull.index(current)
+        before = hull[k - 1]
+        after = hull[(k + 1) % len(hull)]
+
+        #The chain from before to after exposed by deleting current
+        rest = [i for i in left if i != current]
+        newHull = [rest[i] for i in monotoneChainHull([points[i] for i in rest])]
+        chain = [before]
+        while chain[-1] != after:
+            chain.append(newHull[(newHull.index(chain[-1]) + 1) % len(newHull)])
+
+        for p in chain:
+            if (points[p].y > points[current].y) == (string[0] == "U"):
+                jump(rest, p, string[1:], path + [p])
+
+    everything = list(range(len(points)))
+    for start in monotoneChainHull(points):
+        jump(everything, start, string, [start])
+    return paths
+
+def hullJumpingPaths(points, string):
+    '''hullJumping's paths as tuples of indices into points, first point first'''
+
+    indices = {id(p): i for i, p in enumerate(points)}
+    return [tuple(indices[id(p)] for p in reversed(path)) for path in hullJumping(points, string)]
+
+def checkAgainstBruteForce(points, string):
+    paths = hullJumpingPaths(points, string)
+    assert len(set(paths)) == len(paths)
+    assert set(paths) == bruteHullJumping(points, string)
+    assert hullJumping(points, string, count=True) == len(paths)
+
+def test_randomPointSets():
+    for seed in range(150):
+        random.seed(seed)
+        n = random.randint(3, 9)
+        checkAgainstBruteForce(generatePoints(1000, 1000, n), randomPathString(n - 1))
+
+def test_convexPointSets():
+    for seed in range(100):
+        random.seed(seed)
+        n = random.randint(3, 9)
+        checkAgainstBruteForce(generateConvexPoints(n), randomPathString(n - 1))
+
+def test_everyStringOnOnePointSet():
+    random.seed(7)
+    points = generatePoints(1000, 1000, 7)
+    for string in levelStrings(7):
+        checkAgainstBruteForce(points, str(string))
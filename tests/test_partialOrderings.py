@@ -0,0 +1,35 @@
+import random
+
+import numpy as np
+
+from PartialOrderings import *
+
+def test_everyStringOnFewPoints():
+    solved = {}
+    for n in range(2, 13):
+        table = partialOrderingsTable(n)
+        assert table.dtype == np.int64
+        assert len(table) == 2 ** (n - 1)
+        for string in PathString.level(n - 1):
+            assert table[string.bits] == partialOrderings(string, solved)
+
+def test_countsPastOneLimb():
+    random.seed(0)
+    solved = {}
+    for n in (16, 20):
+        table = partialOrderingsTable(n)
+        assert table.dtype == np.int64
+        assert table.max() >= 2 ** LIMB_BITS
+        large = np.flatnonzero(table >= 2 ** LIMB_BITS).tolist()
+        for bits in random.sample(large, 10) + [random.getrandbits(n - 1) for i in range(10)]:
+            assert table[bits] == partialOrderings(PathString(bits, n - 1), solved)
+
+def test_countsPastInt64():
+    random.seed(1)
+    table = partialOrderingsTable(24)
+    assert table.dtype == object
+    overflowing = [bits for bits, count in enumerate(table.tolist()) if count >= 2 ** 63]
+    assert overflowing
+    solved = {}
+    for bits in random.sample(overflowing, 5) + [random.getrandbits(23) for i in range(5)]:
+        assert table[bits] == partialOrderings(PathString(bits, 23), solved)
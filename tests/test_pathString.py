@@ -0,0 +1,112 @@
+import itertools
+import pickle
+
+import pytest
+
+from PathString import *
+
+def textStrings(maxLength):
+    for length in range(1, maxLength + 1):
+        for letters in itertools.product("UD", repeat=length):
+            yield "".join(letters)
+
+def test_packing():
+    for length in range(0, 9):
+        level = PathString.level(length)
+        assert [str(string) for string in level] == ["".join(letters)
+            for letters in itertools.product("UD", repeat=length)]
+        for bits, string in enumerate(level):
+            assert string.bits == bits
+            assert string.length == length
+            assert PathString(str(string)) == string
+            assert PathString(bits, length) == string
+            assert pathStringToBits(str(string)) == bits
+            assert bitsToPathString(bits, length) == str(string)
+            assert pickle.loads(pickle.dumps(string)) == string
+    assert PathString("U") != PathString("UU")
+    assert PathString("") != PathString("U")
+
+def test_letters():
+    for text in textStrings(9):
+        string = PathString(text)
+        assert [string.letter(i) for i in range(len(text))] == list(text)
+        assert [string.isDown(i) for i in range(len(text))] == [c == "D" for c in text]
+        assert string.startsDown() == (text[0] == "D")
+        assert string.endsUp() == (text[-1] == "U")
+
+def test_suffixAndPrefix():
+    for text in textStrings(9):
+        string = PathString(text)
+        assert str(string.suffix()) == text[1:]
+        assert str(string.prefix()) == text[:-1]
+        assert string.suffix() == PathString(text[1:])
+        assert string.prefix() == PathString(text[:-1])
+
+def test_valleysAndContract():
+    for text in textStrings(9):
+        string = PathString(text)
+        valleys = [i for i in range(len(text) - 1) if text[i:i + 2] == "UD"]
+        assert string.valleys() == valleys
+        for i in range(len(text) - 1):
+            for down in (False, True):
+                expected = text[:i] + ("D" if down else "U") + text[i + 2:]
+                assert str(string.contract(i, down)) == expected
+                assert string.contract(i, down) == PathString(expected)
+        assert string.valleyPartials() == [
+            (i, PathString(text[:i] + "U" + text[i + 2:]), PathString(text[:i] + "D" + text[i + 2:]))
+            for i in valleys]
+
+def test_partials():
+    for text in textStrings(9):
+        expected = []
+        if len(text) > 1:
+            if text[0] == "D":
+                expected.append(text[1:])
+            if text[-1] == "U":
+                expected.append(text[:-1])
+            for i in range(len(text) - 1):
+                if text[i:i + 2] == "UD":
+                    expected += [text[:i] + "U" + text[i + 2:], text[:i] + "D" + text[i + 2:]]
+        assert [str(partial) for partial in PathString(text).partials()] == expected
+
+def test_reverseComplement():
+    swap = {"U": "D", "D": "U"}
+    for text in [""] + list(textStrings(10)):
+        string = PathString(text)
+        expected = "".join(swap[c] for c in reversed(text))
+        assert str(string.reverseComplement()) == expected
+        assert string.reverseComplement() == PathString(expected)
+        assert string.reverseComplement().reverseComplement() == string
+
+def test_validation():
+    for bits, length in [(8, 3), (-1, 3), (0, -1), (2, 1)]:
+        with pytest.raises(ValueError):
+            PathString(bits, length)
+    for text in ["UX", "ud", "U D"]:
+        with pytest.raises(ValueError):
+            PathString(text)
+    assert PathString(7, 3) == PathString("DDD")
+    assert PathString(0, 0) == PathString("")
+
+def test_emptyString():
+    empty = PathString("")
+    assert not empty.startsDown()
+    assert not empty.endsUp()
+    assert empty.suffix() == empty
+    assert empty.prefix() == empty
+    assert empty.valleys() == []
+    assert empty.valleyPartials() == []
+    assert empty.partials() == []
+
+def test_textLookups():
+    solved = PathStringDict((string, str(string)) for string in PathString.level(4))
+    for text in ("".join(letters) for letters in itertools.product("UD", repeat=4)):
+        assert text in solved
+        assert solved[text] == text
+        assert solved.get(text) == text
+        assert solved[PathString(text)] == text
+    for key in ["UDU", "UDUX", 5, PathString("UDU")]:
+        assert key not in solved
+        assert solved.get(key, None) is None
+        with pytest.raises(KeyError):
+            solved[key]
@@ -0,0 +1,207 @@
+import itertools
+
+import pytest
+
+from CleanSolution import *
+
+#Sizes of the seeded point sets, eight sets of each
+SIZES = (3, 4, 5, 6, 7)
+
+def baselineDP(points, string, solved):
+    '''The original segment based pathStringDP on text strings, with case III
+    trying the top point at every UD rather than returning after the first'''
+
+    solved[string] = []
+
+    if len(string) == 1:
+        if string[0] == "U":
+            solved[string].append([LineSegment(points[0], points[1])])
+        else:
+            solved[string].append([LineSegment(points[1], points[0])])
+        return solved
+
+    #Case I: Paths that start at the top point
+    if string[0] == "D":
+        partial = string[1:]
+        if partial not in solved:
+            baselineDP(points[:-1], partial, solved)
+        for partialSolution in solved[partial]:
+            newLine = LineSegment(points[-1], partialSolution[0].pt1)
+            if not any(line.intersect(newLine) for line in partialSolution[1:]):
+                solved[string].append([newLine] + partialSolution)
+
+    #Case II: Paths that end at the top point
+    if string[-1] == "U":
+        partial = string[:-1]
+        if partial not in solved:
+            baselineDP(points[:-1], partial, solved)
+        for partialSolution in solved[partial]:
+            newLine = LineSegment(partialSolution[-1].pt2, points[-1])
+            if not any(line.intersect(newLine) for line in partialSolution[:-1]):
+                solved[string].append(partialSolution + [newLine])
+
+    #Case III: Paths where the top point replaces the edge at a UD
+    for i in range(len(string) - 1):
+        if string[i:i + 2] != "UD":
+            continue
+        for partial in (string[:i] + "U" + string[i + 2:], string[:i] + "D" + string[i + 2:]):
+            if partial not in solved:
+                baselineDP(points[:-1], partial, solved)
+            for partialSolution in solved[partial]:
+                rest = list(partialSolution)
+                oldLine = rest.pop(i)
+                newLine1 = LineSegment(oldLine.pt1, points[-1])
+                newLine2 = LineSegment(points[-1], oldLine.pt2)
+                valid = True
+                for j, line in enumerate(rest):
+                    #The edges before and after share a point with one new edge
+                    if j == i - 1:
+                        valid = not line.intersect(newLine2)
+                    elif j == i:
+                        valid = not line.intersect(newLine1)
+                    else:
+                        valid = not (line.intersect(newLine1) or line.intersect(newLine2))
+                    if not valid:
+                        break
+                if valid:
+                    solved[string].append(rest[:i] + [newLine1, newLine2] + rest[i:])
+    return solved
+
+def toIndexPaths(points, paths):
+    '''Returns a list of segment paths as a set of index paths'''
+
+    indices = {id(p): i for i, p in enumerate(points)}
+    return {bytes([indices[id(path[0].pt1)]] + [indices[id(line.pt2)] for line in path])
+            for path in paths}
+
+def allStrings(n):
+    return ["".join(letters) for letters in itertools.product("UD", repeat=n - 1)]
+
+@pytest.fixture(scope="module")
+def pointSets():
+    '''Seeded point sets sorted by height with every string solved by
+    baselineDP, as (points, {text: set of index paths}) pairs'''
+
+    sets = []
+    for n in SIZES:
+        for points in generatePointSets(1000, 1000, n, 8, seed=n):
+            points.sort(key=lambda p: p.y)
+            solved = {}
+            expected = {}
+            for string in allStrings(n):
+                baselineDP(points, string, solved)
+                expected[string] = toIndexPaths(points, solved[string])
+            sets.append((points, expected))
+    return sets
+
+def test_baselineFindsLaterValleys(pointSets):
+    #The original returned after the first UD, so check the port finds paths
+    #with the top point at a later one
+    later = 0
+    for points, expected in pointSets:
+        top = len(points) - 1
+        for string, paths in expected.items():
+            for path in paths:
+                k = path.index(top)
+                if 0 < k < top and string.index("UD") < k - 1:
+                    later += 1
+    assert later > 0
+
+def test_pathStringIndexDP(pointSets):
+    for points, expected in pointSets:
+        solved = {}
+        for string, paths in expected.items():
+            pathStringIndexDP(points, string, solved)
+            found = solved[PathString(string)]
+            assert len(found) == len(set(found))
+            assert set(found) == paths
+
+def test_pathStringDP(pointSets):
+    for points, expected in pointSets:
+        solved = PathStringDict()
+        for string, paths in expected.items():
+            pathStringDPWrapper(points, string, solved, True)
+            assert toIndexPaths(points, solved[string]) == paths
+        assert toIndexPaths(points, pathStringDP(points, string)[string]) == paths
+
+@pytest.mark.parametrize("symmetric", [True, False])
+def test_levelSweep(pointSets, symmetric):
+    for points, expected in pointSets:
+        level = levelSweep(points, symmetric=symmetric)
+        assert [str(string) for string in level] == list(expected)
+        for string, paths in expected.items():
+            assert set(level[string]) == paths
+
+def test_pathStringSolverEviction(pointSets):
+    for points, expected in pointSets:
+        solver = PathStringSolver(points, 1000, True)
+        for string, paths in expected.items():
+            assert set(solver.solve(string)) == paths
+            assert solver.count(string) == len(paths)
+            assert solver.cacheBytes <= 1000
+
+@pytest.mark.parametrize("shared", [True, False])
+def test_iterSolutions(pointSets, shared):
+    for points, expected in pointSets:
+        crossings = SegmentCrossingTable(points)
+        for string, paths in expected.items():
+            found = list(iterSolutions(points, string, True, crossings, shared))
+            assert len(found) == len(set(found))
+            assert set(found) == paths
+
+def test_hasSolution(pointSets):
+    for points, expected in pointSets:
+        failed = set()
+        for string, paths in expected.items():
+            assert hasSolution(points, string, True, None, failed) == bool(paths)
+
+def test_diskPathCacheResume(pointSets, tmp_path):
+    for points, expected in pointSets[::4]:
+        n = len(points)
+
+        #Fill the cache with the levels below the top as an interrupted run would
+        cache = DiskPathCache(str(tmp_path), points)
+        levelSweep(points[:-1], cache=cache)
+        cache.close()
+
+        cache = DiskPathCache(str(tmp_path), points)
+        assert len(cache) == 2 ** (n - 1) - 2
+        level = levelSweep(points, cache=cache)
+        cache.close()
+        for string, paths in expected.items():
+            assert set(level[string]) == paths
+
+        cache = DiskPathCache(str(tmp_path), points)
+        level = levelSweep(points, cache=cache)
+        for string, paths in expected.items():
+            assert set(cache[string]) == paths
+            assert set(level[string]) == paths
+        cache.close()
+
+def test_addTopPoint(pointSets):
+    for points, expected in pointSets:
+        below = points[:-1]
+        crossings = SegmentCrossingTable(below)
+        level = addTopPoint(below, levelSweep(below, crossings), points[-1], crossings)
+        for string, paths in expected.items():
+            assert set(level[string]) == paths
+
+        solver = PathStringSolver(points[:-1], None, True)
+        level = solver.addTopPoint(points[-1])
+        for string, paths in expected.items():
+            assert set(level[string]) == paths
+
+def test_parallelSweepLevel(pointSets, monkeypatch):
+    import CleanSolution
+    monkeypatch.setattr(CleanSolution, "PARALLEL_LEVEL_SIZE", 1)
+    for points, expected in pointSets[-8::4]:
+        crossings = SegmentCrossingTable(points)
+        level = PathStringDict()
+        with levelPool(2, crossings) as pool:
+            for k in range(2, len(points) + 1):
+                level = sweepLevel(k, level, crossings, 2, pool=pool)
+        for string, paths in expected.items():
+            assert set(level[string]) == paths
+        level = sweepLevel(len(points), levelSweep(points[:-1], crossings), crossings, 3)
+        for string, paths in expected.items():
+            assert set(level[string]) == paths
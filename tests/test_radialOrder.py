@@ -0,0 +1,53 @@
+import functools
+import random
+
+from CleanSolution import *
+
+def checkHullNeighbors(points, subsets):
+    n = len(points)
+    radial = RadialOrder(points)
+    for c in range(n):
+        byComparison = sorted((q for q in range(n) if q != c),
+                              key=functools.cmp_to_key(lambda p, q: radial.compare(c, p, q)))
+        assert radial.order[c] == byComparison
+
+    for t in range(subsets):
+        mask = random.getrandbits(n)
+        members = [i for i in range(n) if mask >> i & 1]
+        hull = [members[i] for i in monotoneChainHull([points[i] for i in members])]
+        for c in members:
+            others = mask & ~(1 << c)
+            found = radial.hullNeighbors(c, others)
+            assert found == radial.hullNeighbors(c, [i != c and bool(mask >> i & 1)
+                                                     for i in range(n)])
+            if len(hull) < 3:
+                continue
+            if c in hull:
+                k = hull.index(c)
+                assert found == (hull[(k + 1) % len(hull)], hull[k - 1])
+            else:
+                assert found is None
+
+def test_randomPointSets():
+    for seed in range(60):
+        random.seed(seed)
+        checkHullNeighbors(generatePoints(1000, 1000, random.randint(2, 30)), 20)
+
+def test_gridPointSets():
+
+    #Small integer grids have many collinear points and repeated angles
+    for seed in range(60):
+        random.seed(seed)
+        n = random.randint(2, 20)
+        coordinates = set()
+        while len(coordinates) < n:
+            coordinates.add((random.randint(0, 5), random.randint(0, 5)))
+        checkHullNeighbors([Pt(x, y) for x, y in sorted(coordinates)], 20)
+
+def test_notAVertex():
+    points = [Pt(0, 0), Pt(4, 0), Pt(2, 4), Pt(2, 1), Pt(2, 0)]
+    radial = RadialOrder(points)
+    everything = (1 << len(points)) - 1
+    assert radial.hullNeighbors(3, everything & ~(1 << 3)) is None
+    assert radial.hullNeighbors(4, everything & ~(1 << 4)) is None
+    assert radial.hullNeighbors(0, everything & ~1) == (1, 2)